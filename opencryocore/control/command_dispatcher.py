@@ -0,0 +1,208 @@
+# File: /opencryocore/control/command_dispatcher.py
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterable, List, Optional
+
+
+class CommandDispatcher:
+    """
+    Fans batched operator commands out to many CryoCoreControllers at once.
+
+    Controllers are registered with optional tags and a region. A command names an action
+    (activate, shutdown, set_power_budget, set_cycle_period) and selects its targets by
+    cluster ID, tag and/or region. Calls run concurrently on a thread pool and results are
+    returned as one aggregated acknowledgement. The timeout is a deadline for the whole
+    command, counted from submission: calls still queued behind hung controllers when it
+    passes are cancelled and reported as timed out along with the ones still running.
+
+    Every command carries an idempotency key, bound to the command's action and value.
+    Targets that already acknowledged a key are not called again when the command is retried;
+    only failed ones are, and timed-out ones that were cancelled before starting or whose late
+    call has finished without success.
+    Reusing a key for a different command is rejected. A timed-out call cannot be interrupted:
+    it keeps its worker thread until the controller returns, and is acknowledged then.
+    """
+
+    ACTIONS = {
+        "activate": lambda controller, value: controller.initialize(),
+        "shutdown": lambda controller, value: controller.shutdown(),
+        "set_power_budget": lambda controller, value: controller.set_power_budget(value),
+        "set_cycle_period": lambda controller, value: controller.set_cycle_period(value),
+    }
+
+    def __init__(self, max_workers: int = 64, default_timeout_sec: float = 2.0, max_remembered_keys: int = 1024):
+        """
+        :param max_workers: Number of concurrent controller calls
+        :param default_timeout_sec: Per-target timeout when a command does not set one
+        :param max_remembered_keys: How many idempotency keys to keep commands and acknowledgements for
+        """
+        self.default_timeout_sec = default_timeout_sec
+        self.max_remembered_keys = max_remembered_keys
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cryocore-cmd")
+        self.controllers: Dict[str, object] = {}
+        self.tags: Dict[str, set] = {}
+        self.regions: Dict[str, Optional[str]] = {}
+        self._keys: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, controller, tags: Iterable[str] = (), region: Optional[str] = None):
+        """
+        Adds a controller to the registry, keyed by its cluster_id.
+        """
+        cluster_id = controller.cluster_id
+        self.controllers[cluster_id] = controller
+        self.tags[cluster_id] = set(tags)
+        self.regions[cluster_id] = region
+
+    def unregister(self, cluster_id: str):
+        self.controllers.pop(cluster_id, None)
+        self.tags.pop(cluster_id, None)
+        self.regions.pop(cluster_id, None)
+
+    def select_targets(self, cluster_ids: Iterable[str] = None, tags: Iterable[str] = None,
+                       region: Optional[str] = None) -> List[str]:
+        """
+        Resolves a target selector to cluster IDs. Each given criterion narrows the selection;
+        a controller matches `tags` if it carries any of them. No criteria selects everything.
+        """
+        wanted_ids = set(cluster_ids) if cluster_ids is not None else None
+        wanted_tags = set(tags) if tags is not None else None
+        selected = []
+        for cluster_id in self.controllers:
+            if wanted_ids is not None and cluster_id not in wanted_ids:
+                continue
+            if wanted_tags is not None and not (self.tags[cluster_id] & wanted_tags):
+                continue
+            if region is not None and self.regions[cluster_id] != region:
+                continue
+            selected.append(cluster_id)
+        return selected
+
+    def _claim_key(self, key: str, action: str, value) -> dict:
+        """
+        Returns the record for an idempotency key, creating it on first use.
+        Raises ValueError if the key was already used for a different action or value.
+        """
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                entry = {"action": action, "value": value, "acked": set(), "in_flight": set()}
+                self._keys[key] = entry
+            elif (entry["action"], entry["value"]) != (action, value):
+                raise ValueError(f"Idempotency key '{key}' was already used for {entry['action']} "
+                                 f"({entry['value']}); use a new key for {action} ({value})")
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.max_remembered_keys:
+                self._keys.popitem(last=False)
+            return entry
+
+    def _finish_call(self, entry: dict, cluster_id: str, future):
+        """
+        Done-callback of every call, including ones that finish after their timeout.
+        """
+        with self._lock:
+            entry["in_flight"].discard(cluster_id)
+            if not future.cancelled() and future.exception() is None:
+                entry["acked"].add(cluster_id)
+
+    def _run_one(self, action: str, value, cluster_id: str) -> float:
+        started = time.monotonic()
+        self.ACTIONS[action](self.controllers[cluster_id], value)
+        return time.monotonic() - started
+
+    def dispatch(self, command: dict) -> dict:
+        """
+        Executes one command against all of its targets.
+
+        :param command: Dict with keys
+            action: one of ACTIONS
+            value: argument for set_power_budget / set_cycle_period
+            cluster_ids, tags, region: target selector (see select_targets)
+            idempotency_key: optional; generated if missing. Reusing it for another action/value raises ValueError
+            timeout_sec: optional deadline for all targets, counted from submission
+        :return: Aggregated acknowledgement with one entry per target
+        """
+        action = command.get("action")
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown action '{action}'. Expected one of {sorted(self.ACTIONS)}")
+        value = command.get("value")
+        if action in ("set_power_budget", "set_cycle_period") and value is None:
+            raise ValueError(f"Action '{action}' requires a value")
+
+        key = command.get("idempotency_key") or uuid.uuid4().hex
+        timeout_sec = command.get("timeout_sec", self.default_timeout_sec)
+        targets = self.select_targets(command.get("cluster_ids"), command.get("tags"), command.get("region"))
+        start = time.monotonic()
+
+        entry = self._claim_key(key, action, value)
+        acks = {}
+        pending = {}
+        for cluster_id in targets:
+            with self._lock:
+                if cluster_id in entry["acked"]:
+                    acks[cluster_id] = {"cluster_id": cluster_id, "status": "duplicate"}
+                    continue
+                if cluster_id in entry["in_flight"]:
+                    # A timed-out call from an earlier attempt is still running
+                    acks[cluster_id] = {"cluster_id": cluster_id, "status": "in_progress"}
+                    continue
+                entry["in_flight"].add(cluster_id)
+            future = self.executor.submit(self._run_one, action, value, cluster_id)
+            future.add_done_callback(lambda f, cid=cluster_id: self._finish_call(entry, cid, f))
+            pending[future] = cluster_id
+
+        # One deadline from submission, so targets queued behind hung calls cannot wait forever
+        deadline = start + timeout_sec
+        while pending:
+            done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0.0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+
+            for future in done:
+                cluster_id = pending.pop(future)
+                # wait() can return before the done-callback ran; record now so an immediate retry sees it
+                self._finish_call(entry, cluster_id, future)
+                try:
+                    elapsed = future.result()
+                    acks[cluster_id] = {"cluster_id": cluster_id, "status": "ok", "elapsed_sec": round(elapsed, 4)}
+                except Exception as e:
+                    acks[cluster_id] = {"cluster_id": cluster_id, "status": "error", "error": str(e)}
+
+        for future, cluster_id in pending.items():
+            # Calls that never started are cancelled and their done-callback frees the key for a retry;
+            # running calls cannot be interrupted, their done-callback records the ack if they succeed
+            started = not future.cancel()
+            acks[cluster_id] = {"cluster_id": cluster_id, "status": "timeout", "timeout_sec": timeout_sec,
+                                "started": started}
+
+        statuses = [ack["status"] for ack in acks.values()]
+        result = {
+            "idempotency_key": key,
+            "action": action,
+            "value": value,
+            "target_count": len(targets),
+            "succeeded": statuses.count("ok"),
+            "duplicates": statuses.count("duplicate"),
+            "failed": statuses.count("error"),
+            "timed_out": statuses.count("timeout"),
+            "in_progress": statuses.count("in_progress"),
+            "elapsed_sec": round(time.monotonic() - start, 4),
+            "acks": [acks[cluster_id] for cluster_id in targets]
+        }
+        print(f"[CommandDispatcher] {action} -> {result['target_count']} targets: "
+              f"{result['succeeded']} ok, {result['duplicates']} duplicate, "
+              f"{result['failed']} failed, {result['timed_out']} timed out, {result['in_progress']} in progress in {result['elapsed_sec']}s.")
+        return result
+
+    def dispatch_batch(self, commands: List[dict]) -> List[dict]:
+        """
+        Executes commands in order; each one is fanned out concurrently across its targets.
+        """
+        return [self.dispatch(command) for command in commands]
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
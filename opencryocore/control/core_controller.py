@@ -1,8 +1,12 @@
 # File: /opencryocore/control/core_controller.py
 
 import time
+from opencryocore.control.cycle_scheduler import AdaptiveCycleScheduler
 from opencryocore.core.environment_sim import EnvironmentSim
+from opencryocore.core.fault_detector import FaultDetector
 from opencryocore.core.hyperpole_cluster import HyperPoleCluster
+from opencryocore.core.sensor_fusion import SensorFusionFilter
+from opencryocore.core.solar_model import SolarModel, HOURS_PER_YEAR
 from opencryocore.hardware.power_interface import PowerInterface
 
 class CryoCoreController:
@@ -11,11 +15,29 @@ class CryoCoreController:
     Integrates cooling cluster, power management, and environmental simulation.
     """
 
-    def __init__(self, cluster_id: str):
+    def __init__(self, cluster_id: str, sensor_array=None, solar_model: SolarModel = None,
+                 power_interface: PowerInterface = None):
+        """
+        :param cluster_id: Identifier of the HyperPole cluster under control
+        :param sensor_array: Optional SensorArray (or anything with read_environment()) feeding the estimator
+        :param solar_model: Site and panel orientation for solar charging (default: south-facing panel in Riyadh)
+        :param power_interface: Battery and panel to use; overrides solar_model when given
+        """
         self.cluster_id = cluster_id
-        self.power_interface = PowerInterface()
+        self.power_interface = power_interface or PowerInterface(solar_model=solar_model or SolarModel())
         self.hyperpole_cluster = HyperPoleCluster(cluster_id=cluster_id, power_budget_watts=360)
         self.environment_sim = EnvironmentSim()
+        self.sensor_array = sensor_array
+        self.sensor_filter = SensorFusionFilter(
+            pole_ids=[cluster_id],
+            initial_temp_c=self.environment_sim.initial_temp_c
+        )
+        self.fault_detector = FaultDetector()
+        self.cycle_seconds = 10
+        self.cycle_scheduler = None
+        self.cycle_count = 0
+        self.clock_hour_of_year = None  # None follows the wall clock; set by run_virtual
+        self.event_innovation_z = 3.0
         self.operational = False
 
     def initialize(self):
@@ -24,33 +46,141 @@ class CryoCoreController:
         self.hyperpole_cluster.activate_cluster()
         self.operational = True
 
-    def run_loop(self, cycle_seconds: int = 10):
+    def run_loop(self, cycle_seconds: int = None):
         """
         Runs the main operational loop with power consumption, cooling, and environment updates.
+        :param cycle_seconds: Cycle period; defaults to the current setting (see set_cycle_period)
         """
-        print(f"[CryoCoreController-{self.cluster_id}] Starting main loop. Cycle time: {cycle_seconds} seconds.")
+        if cycle_seconds is not None:
+            self.cycle_seconds = cycle_seconds
+        mode = "adaptive" if self.cycle_scheduler is not None else "fixed"
+        print(f"[CryoCoreController-{self.cluster_id}] Starting main loop. Cycle time: {self.cycle_seconds} seconds ({mode}).")
         try:
             while self.operational:
-                # Power consumption for cooling and fans
-                power_load_watts = self.hyperpole_cluster.power_budget_watts
-                self.power_interface.consume_power(power_load_watts, cycle_seconds / 3600)
+                # Re-read each cycle so set_cycle_period takes effect on a running loop
+                cycle_seconds = self.cycle_seconds
+                self.run_cycle(cycle_seconds)
+                time.sleep(cycle_seconds)
+        except KeyboardInterrupt:
+            print("[CryoCoreController] Shutdown requested via KeyboardInterrupt.")
+            self.shutdown()
 
-                # Run cooling cycle on cluster
-                self.hyperpole_cluster.run_cooling_cycle(cycle_seconds)
+    def run_virtual(self, duration_seconds: float, ambient_profile=None, start_hour_of_year: float = None) -> float:
+        """
+        Runs cycles back to back in virtual time, without sleeping.
+        :param duration_seconds: Simulated time to cover
+        :param ambient_profile: Optional callable mapping elapsed seconds to ambient temperature (°C)
+        :param start_hour_of_year: Virtual clock start for solar charging; defaults to where it stands (or now)
+        :return: Simulated seconds actually covered (less if the system shut down)
+        """
+        if start_hour_of_year is not None:
+            self.clock_hour_of_year = start_hour_of_year
+        elif self.clock_hour_of_year is None and self.power_interface.solar_model is not None:
+            self.clock_hour_of_year = self.power_interface.solar_model.hour_of_year_now()
+        elapsed = 0.0
+        while self.operational and elapsed < duration_seconds:
+            cycle_seconds = min(self.cycle_seconds, duration_seconds - elapsed)
+            ambient_temp_c = ambient_profile(elapsed) if ambient_profile is not None else None
+            self.run_cycle(cycle_seconds, ambient_temp_c)
+            elapsed += cycle_seconds
+        return elapsed
 
-                # Apply cooling to environment simulation
-                self.environment_sim.apply_cooling(power_load_watts, cycle_seconds)
+    def run_cycle(self, cycle_seconds: float, ambient_temp_c: float = None) -> dict:
+        """
+        Runs a single control cycle. All accounting scales with cycle_seconds, so variable steps are fine.
+        :param cycle_seconds: Length of this cycle in seconds
+        :param ambient_temp_c: Ambient temperature for this cycle; defaults to the simulation's initial temperature
+        :return: Status after the cycle
+        """
+        self.cycle_count += 1
 
-                # Recover ambient heat over the cycle duration
-                self.environment_sim.recover_heat(cycle_seconds)
+        # Solar charging, then power consumption for cooling and fans
+        self.power_interface.charge_battery(cycle_seconds / 3600, self.clock_hour_of_year)
+        if self.clock_hour_of_year is not None:
+            self.clock_hour_of_year = (self.clock_hour_of_year + cycle_seconds / 3600) % HOURS_PER_YEAR
+        power_load_watts = self.hyperpole_cluster.power_budget_watts
+        self.power_interface.consume_power(power_load_watts, cycle_seconds / 3600)
 
-                status = self.get_status()
-                print(f"[CryoCoreController] Cycle status: {status}")
+        # Run cooling cycle on cluster
+        self.hyperpole_cluster.run_cooling_cycle(cycle_seconds)
+        fault_events = self.fault_detector.observe_clusters([self.hyperpole_cluster.cluster_status()])
 
-                time.sleep(cycle_seconds)
-        except KeyboardInterrupt:
-            print("[CryoCoreController] Shutdown requested via KeyboardInterrupt.")
-            self.shutdown()
+        # Apply cooling to environment simulation
+        self.environment_sim.apply_cooling(power_load_watts, cycle_seconds)
+
+        # Recover ambient heat over the cycle duration
+        self.environment_sim.recover_heat(cycle_seconds, ambient_temp_c)
+
+        # Fuse model prediction with sensor readings
+        self._update_estimate(power_load_watts, cycle_seconds, ambient_temp_c)
+
+        if self.cycle_scheduler is not None:
+            self._schedule_next_cycle(cycle_seconds, fault_events)
+
+        status = self.get_status()
+        print(f"[CryoCoreController] Cycle status: {status}")
+        return status
+
+    def enable_adaptive_cycle(self, **scheduler_kwargs):
+        """
+        Switches to adaptive cycle periods. Keyword arguments go to AdaptiveCycleScheduler.
+        While enabled, the scheduler overrides set_cycle_period after every cycle.
+        """
+        scheduler_kwargs.setdefault("initial_seconds", self.cycle_seconds)
+        self.cycle_scheduler = AdaptiveCycleScheduler(**scheduler_kwargs)
+        self.cycle_seconds = self.cycle_scheduler.current_seconds
+        print(f"[CryoCoreController-{self.cluster_id}] Adaptive cycle enabled "
+              f"({self.cycle_scheduler.min_seconds}-{self.cycle_scheduler.max_seconds} seconds).")
+
+    def disable_adaptive_cycle(self):
+        self.cycle_scheduler = None
+
+    def _schedule_next_cycle(self, cycle_seconds: float, fault_events: list):
+        """
+        Picks the next cycle period from the estimated temperature trend, battery margin and sensor events.
+        """
+        innovation = float(self.sensor_filter.innovation_z[0])
+        event = any(e["event"] == "raised" for e in fault_events) or abs(innovation) > self.event_innovation_z
+        battery = self.power_interface.get_battery_status()
+        self.cycle_seconds = self.cycle_scheduler.next_period(
+            cycle_seconds,
+            temp_c=float(self.sensor_filter.temp_c[0]),
+            battery_fraction=battery["battery_level_wh"] / battery["battery_capacity_wh"],
+            event=event
+        )
+
+    def _update_estimate(self, power_load_watts: float, cycle_seconds: float, ambient_temp_c: float = None):
+        """
+        Advances the temperature estimator with the cooling model and the latest sensor sample, if any.
+        """
+        cooling_model = self.environment_sim.cooling_model
+        reading = self.sensor_array.read_environment() if self.sensor_array is not None else {}
+        self.sensor_filter.step(
+            cycle_seconds,
+            ambient_temp_c=ambient_temp_c if ambient_temp_c is not None else self.environment_sim.initial_temp_c,
+            cooling_drop_c=cooling_model.compute_temp_drop(power_load_watts, cycle_seconds),
+            heat_gain_c=cooling_model.inverse_temp_gain(self.environment_sim.heat_gain_watts, cycle_seconds),
+            temp_c=reading.get("temperature_c"),
+            humidity=reading.get("humidity_percent")
+        )
+
+    def set_power_budget(self, watts: float):
+        """
+        Changes the cluster power budget used from the next cycle on.
+        """
+        if watts < 0:
+            raise ValueError(f"Power budget must be non-negative, got {watts}")
+        self.hyperpole_cluster.power_budget_watts = watts
+        print(f"[CryoCoreController-{self.cluster_id}] Power budget set to {watts} W.")
+
+    def set_cycle_period(self, seconds: int):
+        """
+        Changes the main loop cycle period used from the next cycle on.
+        """
+        if seconds <= 0:
+            raise ValueError(f"Cycle period must be positive, got {seconds}")
+        self.cycle_seconds = seconds
+        print(f"[CryoCoreController-{self.cluster_id}] Cycle period set to {seconds} seconds.")
 
     def shutdown(self):
         print(f"[CryoCoreController-{self.cluster_id}] Shutting down system.")
@@ -64,5 +194,7 @@ class CryoCoreController:
             "operational": self.operational,
             "battery_status": self.power_interface.get_battery_status(),
             "environment": self.environment_sim.report(),
-            "cluster_status": self.hyperpole_cluster.cluster_status()
+            "temp_estimate": self.sensor_filter.estimate(self.cluster_id),
+            "cluster_status": self.hyperpole_cluster.cluster_status(),
+            "alerts": self.fault_detector.active_alerts(self.cluster_id)
         }
@@ -0,0 +1,84 @@
+# File: /opencryocore/control/cycle_scheduler.py
+
+class AdaptiveCycleScheduler:
+    """
+    Chooses the controller's next cycle period from what the zone is doing.
+
+    The period is sized so the zone temperature moves by about `target_change_c` per cycle:
+    long cycles when the zone is stable (night, steady state), short ones during transients.
+    A low battery stretches the period to save wake-ups, and sensor events (fault alerts,
+    surprising sensor readings) snap it back to the minimum. Growth is limited per cycle so
+    the period eases out after a transient instead of jumping straight to the maximum.
+    """
+
+    def __init__(self, min_seconds: float = 2.0, max_seconds: float = 120.0, target_change_c: float = 0.05,
+                 growth_factor: float = 1.5, battery_reserve_fraction: float = 0.3, initial_seconds: float = 10.0):
+        """
+        :param min_seconds: Shortest allowed cycle period
+        :param max_seconds: Longest allowed cycle period
+        :param target_change_c: Zone temperature change aimed for per cycle (°C)
+        :param growth_factor: Maximum ratio between consecutive periods when lengthening
+        :param battery_reserve_fraction: Below this battery fraction the period is stretched towards the maximum
+        :param initial_seconds: Period of the first cycle
+        """
+        if not 0 < min_seconds <= max_seconds:
+            raise ValueError(f"Need 0 < min_seconds <= max_seconds, got {min_seconds}, {max_seconds}")
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.target_change_c = target_change_c
+        self.growth_factor = growth_factor
+        self.battery_reserve_fraction = battery_reserve_fraction
+        self.current_seconds = min(max(initial_seconds, min_seconds), max_seconds)
+
+        self.last_temp_c = None
+        self.wakeups = 0
+        self.elapsed_seconds = 0.0
+        self.event_wakeups = 0
+
+    def next_period(self, elapsed_seconds: float, temp_c: float, battery_fraction: float, event: bool = False) -> float:
+        """
+        Records a finished cycle and returns the period for the next one.
+        :param elapsed_seconds: Length of the cycle that just ran
+        :param temp_c: Zone temperature at the end of that cycle
+        :param battery_fraction: Battery level as a fraction of capacity
+        :param event: True if something happened that needs close attention
+        """
+        self.wakeups += 1
+        self.elapsed_seconds += elapsed_seconds
+
+        rate = 0.0
+        if self.last_temp_c is not None and elapsed_seconds > 0:
+            rate = abs(temp_c - self.last_temp_c) / elapsed_seconds
+        self.last_temp_c = temp_c
+
+        if event:
+            self.event_wakeups += 1
+            self.current_seconds = self.min_seconds
+            return self.current_seconds
+
+        period = self.target_change_c / rate if rate > 0 else self.max_seconds
+
+        if battery_fraction < self.battery_reserve_fraction:
+            shortfall = 1.0 - battery_fraction / self.battery_reserve_fraction
+            period += (self.max_seconds - period) * shortfall
+
+        period = min(period, self.current_seconds * self.growth_factor)
+        self.current_seconds = min(max(period, self.min_seconds), self.max_seconds)
+        return self.current_seconds
+
+    def wakeup_report(self, baseline_seconds: float = 10.0) -> dict:
+        """
+        Compares wake-ups so far against a fixed-period loop covering the same time span.
+        """
+        baseline_wakeups = self.elapsed_seconds / baseline_seconds
+        saved = baseline_wakeups - self.wakeups
+        return {
+            "simulated_seconds": round(self.elapsed_seconds, 1),
+            "wakeups": self.wakeups,
+            "event_wakeups": self.event_wakeups,
+            "baseline_seconds": baseline_seconds,
+            "baseline_wakeups": round(baseline_wakeups),
+            "wakeups_saved": round(saved),
+            "saved_percent": round(100.0 * saved / baseline_wakeups, 1) if baseline_wakeups else 0.0,
+            "mean_period_seconds": round(self.elapsed_seconds / self.wakeups, 2) if self.wakeups else None
+        }
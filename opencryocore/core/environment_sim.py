@@ -10,15 +10,18 @@ class EnvironmentSim:
     Accounts for cooling input, thermal memory, and ambient heat gain (e.g. solar).
     """
 
-    def __init__(self, initial_temp_c: float = 40.0, radius_ft: float = 9.0, height_ft: float = 20.0):
+    def __init__(self, initial_temp_c: float = 40.0, radius_ft: float = 9.0, height_ft: float = 20.0,
+                 heat_gain_watts: float = 300.0):
         """
         :param initial_temp_c: Starting ambient temperature in °C
         :param radius_ft: Radius of cooled air volume in feet
         :param height_ft: Vertical height of cooled air volume in feet
+        :param heat_gain_watts: Estimated solar + ambient heat gain in watts; tune as needed
         """
         self.initial_temp_c = initial_temp_c
         self.radius_ft = radius_ft
         self.height_ft = height_ft
+        self.heat_gain_watts = heat_gain_watts
 
         self.air_volume_m3 = self._calculate_air_volume_m3(radius_ft, height_ft)
         self.cooling_model = CoolingModel(self.air_volume_m3)
@@ -50,8 +53,7 @@ class EnvironmentSim:
         Models ambient heat gain and temperature rebound over time.
         """
         ambient_temp_c = ambient_temp_c if ambient_temp_c is not None else self.initial_temp_c
-        heat_gain_watts = 300  # Estimated solar + ambient gain in watts; tune as needed
-        temp_gain = self.cooling_model.inverse_temp_gain(heat_gain_watts, seconds)
+        temp_gain = self.cooling_model.inverse_temp_gain(self.heat_gain_watts, seconds)
         self.current_temp_c = min(self.current_temp_c + temp_gain, ambient_temp_c)
         self.last_update_time = time.time()
 
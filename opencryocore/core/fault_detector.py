@@ -0,0 +1,226 @@
+# File: /opencryocore/core/fault_detector.py
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+# Alert kinds, one column each in the condition matrix
+ALERT_KINDS = ["fan_stopped", "piston_flatline", "fan_peer_deviation", "piston_peer_deviation", "piston_spike"]
+
+
+class FaultDetector:
+    """
+    Online fault and anomaly detection over HyperPoleUnit telemetry.
+
+    Keeps O(1)-update rolling statistics per unit (EWMA mean/variance of fan RPM and piston
+    output, stuck-value counters) in flat numpy arrays and compares each unit with the other
+    units of its cluster. Alerts are deduplicated: an alert is raised once when its condition
+    starts and cleared when it ends, so the status payload only lists what is currently wrong.
+    """
+
+    def __init__(self, alpha: float = 0.1, spike_z: float = 4.0, peer_z: float = 3.0, stuck_cycles: int = 5,
+                 stuck_epsilon: float = 1e-6, min_fan_rpm: float = 1.0, warmup_cycles: int = 20,
+                 fan_std_floor: float = 50.0, piston_std_floor: float = 2.0, record: bool = False,
+                 max_events: int = 10000):
+        """
+        :param alpha: EWMA smoothing factor (higher reacts faster)
+        :param spike_z: Deviation from a unit's own EWMA, in standard deviations, counted as a spike
+        :param peer_z: Deviation from the cluster mean, in peer standard deviations, counted as an outlier
+        :param stuck_cycles: Consecutive unchanged piston readings before a flatline alert
+        :param stuck_epsilon: Readings closer than this are considered unchanged
+        :param min_fan_rpm: An operational unit's fan below this RPM is considered stopped
+        :param warmup_cycles: Cycles before EWMA-based checks are trusted (roughly 2 / alpha)
+        :param fan_std_floor: Minimum peer spread for fan RPM (healthy fans all report the same RPM)
+        :param piston_std_floor: Minimum spread for piston output in watts
+        :param record: Keep every observed frame for later replay
+        :param max_events: How many recent raised/cleared events to keep in .events
+        """
+        self.alpha = alpha
+        self.spike_z = spike_z
+        self.peer_z = peer_z
+        self.stuck_cycles = stuck_cycles
+        self.stuck_epsilon = stuck_epsilon
+        self.min_fan_rpm = min_fan_rpm
+        self.warmup_cycles = warmup_cycles
+        self.fan_std_floor = fan_std_floor
+        self.piston_std_floor = piston_std_floor
+        self.record = record
+
+        self.cycle = 0
+        self.unit_ids: List[str] = []
+        self.cluster_ids: List[str] = []
+        self.frames: List[dict] = []
+        self.events: "deque[dict]" = deque(maxlen=max_events)
+        self.alerts: Dict[tuple, dict] = {}
+        self._reset_state(0)
+
+    def _reset_state(self, n: int):
+        self.group = np.zeros(n, dtype=np.int64)
+        self.group_count = 0
+        self.samples = np.zeros(n, dtype=np.int64)
+        self.fan_mean = np.zeros(n)
+        self.fan_var = np.zeros(n)
+        self.piston_mean = np.zeros(n)
+        self.piston_var = np.zeros(n)
+        self.piston_last = np.full(n, np.nan)
+        self.piston_stuck = np.zeros(n, dtype=np.int64)
+        self.active = np.zeros((n, len(ALERT_KINDS)), dtype=bool)
+        self.alerts = {}
+
+    def _ensure_layout(self, unit_ids: List[str], cluster_ids: List[str]):
+        """
+        Resets per-unit state whenever the fleet layout changes.
+        """
+        if unit_ids == self.unit_ids and cluster_ids == self.cluster_ids:
+            return
+        self.unit_ids = list(unit_ids)
+        self.cluster_ids = list(cluster_ids)
+        self._reset_state(len(unit_ids))
+        group_index = {}
+        self.group = np.array([group_index.setdefault(c, len(group_index)) for c in cluster_ids], dtype=np.int64)
+        self.group_count = len(group_index)
+
+    def _peer_z(self, values: np.ndarray, operational: np.ndarray, std_floor: float) -> np.ndarray:
+        """
+        Distance of each unit from the operational mean of its cluster peers, in peer standard deviations.
+        The unit itself is left out of its peer statistics so a single outlier cannot mask itself.
+        """
+        weights = operational.astype(float)
+        count = np.bincount(self.group, weights, minlength=self.group_count)[self.group] - weights
+        total = np.bincount(self.group, values * weights, minlength=self.group_count)[self.group] - values * weights
+        total_sq = (np.bincount(self.group, values * values * weights, minlength=self.group_count)[self.group]
+                    - values * values * weights)
+        peers = np.maximum(count, 1.0)
+        mean = total / peers
+        std = np.sqrt(np.maximum(total_sq / peers - mean * mean, 0.0))
+        z = np.abs(values - mean) / np.maximum(std, std_floor)
+        # Need at least two peers to compare against
+        return np.where(count >= 2.0, z, 0.0)
+
+    def observe(self, unit_ids: List[str], cluster_ids: List[str], fan_rpm, piston_w, operational) -> List[dict]:
+        """
+        Processes one telemetry frame for the whole fleet.
+
+        :param unit_ids: Unit identifiers, in frame order
+        :param cluster_ids: Owning cluster of each unit
+        :param fan_rpm: Fan RPM per unit
+        :param piston_w: Piston generator output per unit in watts
+        :param operational: Whether each unit is supposed to be running
+        :return: Alert events (raised/cleared) produced by this frame
+        """
+        self._ensure_layout(unit_ids, cluster_ids)
+        fan = np.asarray(fan_rpm, dtype=float)
+        piston = np.asarray(piston_w, dtype=float)
+        op = np.asarray(operational, dtype=bool)
+        self.cycle += 1
+
+        if self.record:
+            self.frames.append({"fan_rpm": fan.copy(), "piston_w": piston.copy(), "operational": op.copy()})
+
+        warm = self.samples >= self.warmup_cycles
+        piston_spike = warm & op & (np.abs(piston - self.piston_mean) >
+                                    self.spike_z * np.maximum(np.sqrt(self.piston_var), self.piston_std_floor))
+
+        # EWMA mean/variance over operational samples only; the first one seeds the mean
+        a = np.where(op, np.where(self.samples == 0, 1.0, self.alpha), 0.0)
+        for value, mean, var in ((fan, self.fan_mean, self.fan_var), (piston, self.piston_mean, self.piston_var)):
+            diff = value - mean
+            incr = a * diff
+            mean += incr
+            var *= (1.0 - a)
+            var += (1.0 - a) * diff * incr
+        self.samples += op
+
+        unchanged = np.abs(piston - self.piston_last) <= self.stuck_epsilon
+        self.piston_stuck = np.where(op & unchanged, self.piston_stuck + 1, 0)
+        self.piston_last = piston
+
+        conditions = np.empty_like(self.active)
+        conditions[:, 0] = op & (fan < self.min_fan_rpm)
+        conditions[:, 1] = op & (self.piston_stuck >= self.stuck_cycles)
+        conditions[:, 2] = op & warm & (self._peer_z(self.fan_mean, op, self.fan_std_floor) > self.peer_z)
+        conditions[:, 3] = op & warm & (self._peer_z(self.piston_mean, op, self.piston_std_floor) > self.peer_z)
+        conditions[:, 4] = piston_spike
+
+        return self._update_alerts(conditions, fan, piston)
+
+    def _update_alerts(self, conditions: np.ndarray, fan: np.ndarray, piston: np.ndarray) -> List[dict]:
+        events = []
+        raised = conditions & ~self.active
+        cleared = self.active & ~conditions
+
+        for slot, kind_index in zip(*np.nonzero(raised)):
+            kind = ALERT_KINDS[kind_index]
+            alert = {
+                "unit_id": self.unit_ids[slot],
+                "cluster_id": self.cluster_ids[slot],
+                "kind": kind,
+                "since_cycle": self.cycle,
+                "fan_rpm": float(fan[slot]),
+                "piston_w": float(piston[slot])
+            }
+            self.alerts[(slot, kind)] = alert
+            events.append(dict(alert, event="raised"))
+
+        for slot, kind_index in zip(*np.nonzero(cleared)):
+            alert = self.alerts.pop((slot, ALERT_KINDS[kind_index]))
+            events.append(dict(alert, event="cleared", cleared_cycle=self.cycle))
+
+        self.active = conditions
+        self.events.extend(events)
+        for event in events:
+            print(f"[FaultDetector] {event['event'].upper()} {event['kind']} on {event['unit_id']}")
+        return events
+
+    def observe_clusters(self, cluster_statuses: Iterable[dict]) -> List[dict]:
+        """
+        Convenience wrapper taking HyperPoleCluster.cluster_status() dicts directly.
+        """
+        unit_ids, cluster_ids, fan, piston, op = [], [], [], [], []
+        for cluster in cluster_statuses:
+            cluster_id = cluster["cluster_id"]
+            for unit in cluster["units_status"]:
+                unit_ids.append(unit["unit_id"])
+                cluster_ids.append(cluster_id)
+                fan.append(unit["fan_status"]["current_rpm"])
+                piston.append(unit["power_output"])
+                op.append(unit["operational"])
+        return self.observe(unit_ids, cluster_ids, fan, piston, op)
+
+    def active_alerts(self, cluster_id: Optional[str] = None) -> List[dict]:
+        """
+        Currently active alerts, optionally filtered to one cluster.
+        """
+        return [alert for alert in self.alerts.values() if cluster_id is None or alert["cluster_id"] == cluster_id]
+
+    def save_recording(self, path: str):
+        """
+        Writes recorded frames to a compressed .npz file for offline threshold tuning.
+        """
+        np.savez_compressed(
+            path,
+            unit_ids=np.array(self.unit_ids),
+            cluster_ids=np.array(self.cluster_ids),
+            fan_rpm=np.stack([f["fan_rpm"] for f in self.frames]),
+            piston_w=np.stack([f["piston_w"] for f in self.frames]),
+            operational=np.stack([f["operational"] for f in self.frames])
+        )
+
+    @classmethod
+    def replay(cls, recording, **params) -> "FaultDetector":
+        """
+        Re-runs a recording through a fresh detector with the given thresholds.
+
+        :param recording: Path to a save_recording() file, or a dict with the same arrays
+        :param params: Constructor overrides, e.g. peer_z=2.5, stuck_cycles=3
+        :return: The detector after the replay; inspect .events for what it would have raised
+        """
+        if isinstance(recording, str):
+            with np.load(recording) as data:
+                recording = {key: data[key] for key in data.files}
+        detector = cls(**params)
+        unit_ids = [str(u) for u in recording["unit_ids"]]
+        cluster_ids = [str(c) for c in recording["cluster_ids"]]
+        for fan, piston, op in zip(recording["fan_rpm"], recording["piston_w"], recording["operational"]):
+            detector.observe(unit_ids, cluster_ids, fan, piston, op)
+        return detector
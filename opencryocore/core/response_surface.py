@@ -0,0 +1,206 @@
+# File: /opencryocore/core/response_surface.py
+
+import bisect
+import hashlib
+import json
+import math
+import os
+from typing import Dict, List, Optional
+import numpy as np
+from opencryocore.core.environment_sim import EnvironmentSim
+
+# Grid axes, in query order
+AXES = ["ambient_temp_c", "power_watts", "unit_count", "radius_ft", "height_ft"]
+
+DEFAULT_GRID = {
+    "ambient_temp_c": [30.0, 35.0, 40.0, 46.0, 50.0],
+    "power_watts": [0.0, 20.0, 40.0, 60.0, 80.0, 100.0],
+    "unit_count": [1, 3, 6, 9, 18],
+    "radius_ft": [3.0, 6.0, 9.0, 12.0],
+    "height_ft": [10.0, 20.0, 30.0]
+}
+
+
+def model_fingerprint(cycle_seconds: int, horizon_seconds: int, target_drop_c: float, grid: Dict[str, List[float]]) -> str:
+    """
+    Hashes every model constant and build setting the table depends on.
+    Any change to EnvironmentSim / CoolingModel defaults yields a new fingerprint.
+    """
+    reference = EnvironmentSim(radius_ft=1.0, height_ft=1.0)
+    constants = {
+        "air_density_kg_per_m3": reference.cooling_model.air_density_kg_per_m3,
+        "specific_heat_capacity_air": reference.cooling_model.specific_heat_capacity_air,
+        "heat_gain_watts": reference.heat_gain_watts,
+        "unit_volume_m3": reference.air_volume_m3,
+        "cycle_seconds": cycle_seconds,
+        "horizon_seconds": horizon_seconds,
+        "target_drop_c": target_drop_c,
+        "table": "per_cycle_rates",
+        "grid": {axis: [float(v) for v in grid[axis]] for axis in AXES}
+    }
+    return hashlib.sha256(json.dumps(constants, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ResponseSurface:
+    """
+    Precomputed what-if table for zone cooling.
+
+    Evaluates the EnvironmentSim / CoolingModel cycle (cool, then recover heat) over a grid of
+    ambient temperature, per-unit power, HyperPole unit count, radius and height, and stores the
+    net temperature drop and the heat regain of one cycle. Queries interpolate both multilinearly
+    and then evolve the cycle in closed form, so the drop after the horizon and the time to reach
+    the target drop always come from the same rate. Answering one takes microseconds.
+    """
+
+    def __init__(self, cache_path: str = "response_surface.npz", grid: Optional[Dict[str, List[float]]] = None,
+                 cycle_seconds: int = 10, horizon_seconds: int = 3600, target_drop_c: float = 1.7):
+        """
+        :param cache_path: Location of the on-disk table (.npz)
+        :param grid: Axis values per dimension; defaults to DEFAULT_GRID
+        :param cycle_seconds: Controller cycle length used for stepping the model
+        :param horizon_seconds: How long cooling runs before the reported drop is taken
+        :param target_drop_c: Drop used for time-to-target (default 1.7 °C ≈ 3 °F)
+        """
+        self.cache_path = cache_path
+        self.grid = {axis: sorted(float(v) for v in (grid or DEFAULT_GRID)[axis]) for axis in AXES}
+        self.cycle_seconds = cycle_seconds
+        self.horizon_seconds = horizon_seconds
+        self.target_drop_c = target_drop_c
+        self.fingerprint = model_fingerprint(cycle_seconds, horizon_seconds, target_drop_c, self.grid)
+
+        self.net_drop_c = None
+        self.gain_c = None
+        self._net_flat: List[float] = []
+        self._gain_flat: List[float] = []
+        self._strides: List[int] = []
+
+    def load_or_build(self):
+        """
+        Loads the cached table if its fingerprint matches the current model, otherwise rebuilds and saves it.
+        """
+        if os.path.exists(self.cache_path):
+            with np.load(self.cache_path) as data:
+                if str(data["fingerprint"]) == self.fingerprint:
+                    self._set_tables(data["net_drop_c"], data["gain_c"])
+                    print(f"[ResponseSurface] Loaded cached table from {self.cache_path}.")
+                    return self
+            print("[ResponseSurface] Model constants changed, cached table invalidated.")
+        self.build()
+        self.save()
+        return self
+
+    def build(self):
+        """
+        Evaluates the cooling model's per-cycle deltas over the full grid.
+        """
+        shape = tuple(len(self.grid[axis]) for axis in AXES)
+        print(f"[ResponseSurface] Building table over {int(np.prod(shape))} grid points.")
+
+        ambient, power, units, radius, height = np.meshgrid(*[self.grid[axis] for axis in AXES], indexing="ij")
+        drop_per_cycle = np.empty(shape)
+        gain_per_cycle = np.empty(shape)
+
+        # Per-cycle deltas come from the model itself so constant changes carry through
+        for idx in np.ndindex(shape):
+            env = EnvironmentSim(initial_temp_c=ambient[idx], radius_ft=radius[idx], height_ft=height[idx])
+            drop_per_cycle[idx] = env.cooling_model.compute_temp_drop(power[idx] * units[idx], self.cycle_seconds)
+            gain_per_cycle[idx] = env.cooling_model.inverse_temp_gain(env.heat_gain_watts, self.cycle_seconds)
+
+        self._set_tables(drop_per_cycle - gain_per_cycle, gain_per_cycle)
+        return self
+
+    def save(self):
+        """
+        Writes the table and its fingerprint to a compressed .npz file.
+        """
+        np.savez_compressed(
+            self.cache_path,
+            fingerprint=np.array(self.fingerprint),
+            net_drop_c=self.net_drop_c.astype(np.float32),
+            gain_c=self.gain_c.astype(np.float32),
+            **{f"axis_{axis}": np.array(self.grid[axis]) for axis in AXES}
+        )
+        print(f"[ResponseSurface] Saved table to {self.cache_path}.")
+
+    def _set_tables(self, net_drop_c: np.ndarray, gain_c: np.ndarray):
+        self.net_drop_c = np.asarray(net_drop_c, dtype=float)
+        self.gain_c = np.asarray(gain_c, dtype=float)
+        # Plain lists are much faster than numpy scalar indexing for a single lookup
+        self._net_flat = self.net_drop_c.ravel().tolist()
+        self._gain_flat = self.gain_c.ravel().tolist()
+        self._strides = [s // self.net_drop_c.itemsize for s in self.net_drop_c.strides]
+
+    def _evolve(self, ambient_temp_c: float, net_drop_c: float, gain_c: float):
+        """
+        Closed form of stepping EnvironmentSim for the horizon at a constant per-cycle rate.
+        The zone cools by net_drop_c per cycle until it bottoms out at absolute zero plus one
+        cycle of regain, and never warms above ambient. Returns (drop after the horizon, time
+        to the target drop or None if it is not reached within the horizon).
+        """
+        cycles = int(self.horizon_seconds // self.cycle_seconds)
+        if net_drop_c <= 0.0:
+            return 0.0, None
+        floor_drop = ambient_temp_c + 273.15 - gain_c
+        drop = min(cycles * net_drop_c, floor_drop)
+        if drop < self.target_drop_c:
+            return drop, None
+        return drop, float(math.ceil(self.target_drop_c / net_drop_c) * self.cycle_seconds)
+
+    def _axis_position(self, axis: str, value: float):
+        """
+        Returns (lower index, weight of upper neighbour, in_range) for one axis.
+        """
+        values = self.grid[axis]
+        if len(values) == 1:
+            return 0, 0.0, value == values[0]
+        in_range = values[0] <= value <= values[-1]
+        value = min(max(value, values[0]), values[-1])
+        i = min(bisect.bisect_right(values, value) - 1, len(values) - 2)
+        return i, (value - values[i]) / (values[i + 1] - values[i]), in_range
+
+    def query(self, ambient_temp_c: float, power_watts: float, unit_count: float = 9,
+              radius_ft: float = 9.0, height_ft: float = 20.0) -> dict:
+        """
+        Interpolates the zone response for one scenario. Values outside the grid are clamped to its edges.
+        time_to_target_sec is None when the target drop is not reached within the horizon.
+        :param ambient_temp_c: Ambient temperature in °C
+        :param power_watts: Cooling power per unit in watts
+        :param unit_count: Number of units cooling the zone
+        :param radius_ft: Zone radius in feet
+        :param height_ft: Zone height in feet
+        """
+        if self.net_drop_c is None:
+            raise RuntimeError("Response surface not loaded; call load_or_build() first.")
+
+        values = [float(value) for value in (ambient_temp_c, power_watts, unit_count, radius_ft, height_ft)]
+        for axis, value in zip(AXES, values):
+            if not math.isfinite(value):
+                raise ValueError(f"{axis} must be a finite number, got {value}")
+        positions = [self._axis_position(axis, value) for axis, value in zip(AXES, values)]
+
+        net_drop = 0.0
+        gain = 0.0
+        for corner in range(1 << len(AXES)):
+            weight = 1.0
+            offset = 0
+            for d, (i, frac, _) in enumerate(positions):
+                if corner >> d & 1:
+                    weight *= frac
+                    offset += (i + 1) * self._strides[d]
+                else:
+                    weight *= 1.0 - frac
+                    offset += i * self._strides[d]
+            if weight == 0.0:
+                continue
+            net_drop += weight * self._net_flat[offset]
+            gain += weight * self._gain_flat[offset]
+
+        drop, time_to_target = self._evolve(values[0], net_drop, gain)
+        return {
+            "temp_drop_c": round(drop, 3),
+            "final_temp_c": round(values[0] - drop, 2),
+            "time_to_target_sec": time_to_target,
+            "target_drop_c": self.target_drop_c,
+            "horizon_seconds": self.horizon_seconds,
+            "in_range": all(p[2] for p in positions)
+        }
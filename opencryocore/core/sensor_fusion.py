@@ -0,0 +1,122 @@
+# File: /opencryocore/core/sensor_fusion.py
+
+from typing import List, Optional
+import numpy as np
+
+class SensorFusionFilter:
+    """
+    Streaming Kalman-style estimator for zone temperature and humidity across many poles.
+    Combines the EnvironmentSim per-step model prediction with noisy DHT22 readings.
+
+    All state is held in flat numpy arrays (one slot per pole), so every predict/update
+    is a handful of batched array operations regardless of how many poles are tracked.
+    Missing samples (None or NaN) simply skip the update for that pole, letting its
+    uncertainty grow until the next valid reading arrives.
+    """
+
+    def __init__(self, pole_count: int = 1, initial_temp_c: float = 40.0, initial_humidity: float = 20.0,
+                 temp_process_var: float = 0.001,
+                 temp_measurement_var: float = 0.25, humidity_process_var: float = 0.01,
+                 humidity_measurement_var: float = 4.0, pole_ids: Optional[List[str]] = None):
+        """
+        :param pole_count: Number of poles tracked (ignored if pole_ids is given)
+        :param initial_temp_c: Starting temperature estimate in °C
+        :param initial_humidity: Starting relative humidity estimate in %
+        :param temp_process_var: Model drift variance added per second (°C²/s)
+        :param temp_measurement_var: DHT22 temperature noise variance (±0.5 °C → 0.25 °C²)
+        :param humidity_process_var: Humidity random-walk variance per second (%²/s)
+        :param humidity_measurement_var: DHT22 humidity noise variance (±2 % → 4 %²)
+        :param pole_ids: Optional pole identifiers, mapped to array slots in order
+        """
+        self.pole_ids = list(pole_ids) if pole_ids is not None else [str(i) for i in range(pole_count)]
+        self.pole_index = {pole_id: i for i, pole_id in enumerate(self.pole_ids)}
+        n = len(self.pole_ids)
+
+        self.temp_process_var = temp_process_var
+        self.temp_measurement_var = temp_measurement_var
+        self.humidity_process_var = humidity_process_var
+        self.humidity_measurement_var = humidity_measurement_var
+
+        self.temp_c = np.full(n, initial_temp_c, dtype=float)
+        self.temp_var = np.full(n, temp_measurement_var, dtype=float)
+        self.humidity = np.full(n, initial_humidity, dtype=float)
+        self.humidity_var = np.full(n, humidity_measurement_var, dtype=float)
+        self.missed_samples = np.zeros(n, dtype=np.int64)
+        self.innovation_z = np.full(n, np.nan)
+
+    @staticmethod
+    def _as_array(values, n: int) -> np.ndarray:
+        """
+        Converts scalars or sequences (possibly containing None) to a float array of length n.
+        """
+        if values is None:
+            return np.full(n, np.nan)
+        arr = np.asarray(values, dtype=float)
+        return np.broadcast_to(arr, (n,))
+
+    def predict(self, elapsed_sec: float, ambient_temp_c, cooling_drop_c=0.0, heat_gain_c=0.0):
+        """
+        Propagates the estimates forward by one model step.
+
+        Mirrors EnvironmentSim.apply_cooling followed by recover_heat: the CoolingModel drop
+        is subtracted, the ambient heat gain is added back, and the result is clamped at ambient.
+
+        :param elapsed_sec: Step length in seconds
+        :param ambient_temp_c: Uncontrolled ambient temperature (scalar or per-pole array)
+        :param cooling_drop_c: CoolingModel.compute_temp_drop over the step
+        :param heat_gain_c: CoolingModel.inverse_temp_gain of the ambient heat gain over the step
+        """
+        n = len(self.pole_ids)
+        ambient = self._as_array(ambient_temp_c, n)
+        drop = self._as_array(cooling_drop_c, n)
+        gain = self._as_array(heat_gain_c, n)
+
+        self.temp_c = np.minimum(np.maximum(self.temp_c - drop, -273.15) + gain, ambient)
+        self.temp_var = self.temp_var + self.temp_process_var * elapsed_sec
+        self.humidity_var = self.humidity_var + self.humidity_process_var * elapsed_sec
+
+    def update(self, temp_c=None, humidity=None):
+        """
+        Folds in a batch of sensor readings. None/NaN entries are treated as dropouts.
+        :param temp_c: Measured temperatures in °C (scalar or per-pole sequence)
+        :param humidity: Measured relative humidity in % (scalar or per-pole sequence)
+        """
+        n = len(self.pole_ids)
+        z_temp = self._as_array(temp_c, n)
+        z_hum = self._as_array(humidity, n)
+
+        valid = ~np.isnan(z_temp)
+        # Normalized surprise of each reading against the prediction, NaN on dropouts
+        self.innovation_z = np.where(valid, (z_temp - self.temp_c) / np.sqrt(self.temp_var + self.temp_measurement_var),
+                                     np.nan)
+        gain = np.where(valid, self.temp_var / (self.temp_var + self.temp_measurement_var), 0.0)
+        self.temp_c = self.temp_c + gain * np.where(valid, z_temp - self.temp_c, 0.0)
+        self.temp_var = (1.0 - gain) * self.temp_var
+        self.missed_samples = np.where(valid, 0, self.missed_samples + 1)
+
+        valid_hum = ~np.isnan(z_hum)
+        gain = np.where(valid_hum, self.humidity_var / (self.humidity_var + self.humidity_measurement_var), 0.0)
+        self.humidity = self.humidity + gain * np.where(valid_hum, z_hum - self.humidity, 0.0)
+        self.humidity_var = (1.0 - gain) * self.humidity_var
+
+    def step(self, elapsed_sec: float, ambient_temp_c, cooling_drop_c=0.0, heat_gain_c=0.0, temp_c=None,
+             humidity=None):
+        """
+        Runs one predict/update tick for every pole.
+        """
+        self.predict(elapsed_sec, ambient_temp_c, cooling_drop_c, heat_gain_c)
+        self.update(temp_c, humidity)
+
+    def estimate(self, pole_id: Optional[str] = None) -> dict:
+        """
+        Returns the smoothed estimate and its uncertainty for a single pole.
+        :param pole_id: Pole identifier; defaults to the first tracked pole
+        """
+        i = self.pole_index[pole_id] if pole_id is not None else 0
+        return {
+            "temp_c": round(float(self.temp_c[i]), 2),
+            "temp_std_c": round(float(np.sqrt(self.temp_var[i])), 3),
+            "humidity_percent": round(float(self.humidity[i]), 1),
+            "humidity_std_percent": round(float(np.sqrt(self.humidity_var[i])), 2),
+            "missed_samples": int(self.missed_samples[i])
+        }
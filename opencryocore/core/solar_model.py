@@ -0,0 +1,183 @@
+# File: /opencryocore/core/solar_model.py
+
+import time
+from functools import lru_cache
+from typing import Dict, List, Sequence
+import numpy as np
+
+DAYS_PER_YEAR = 365
+HOURS_PER_YEAR = DAYS_PER_YEAR * 24
+
+
+@lru_cache(maxsize=64)
+def _irradiance_table(latitude_deg: float, longitude_deg: float, utc_offset_hours: float, tilt_deg: float,
+                      azimuth_deg: float, albedo: float, steps_per_hour: int) -> np.ndarray:
+    """
+    Clear-sky plane-of-array irradiance (W/m²) for every day of the year and time step.
+    Shape is (365, 24 * steps_per_hour); each step is evaluated at its midpoint in local standard time.
+    Cached per site and panel orientation, and returned read-only.
+    """
+    day = np.arange(1, DAYS_PER_YEAR + 1)[:, None]
+    local_hour = (np.arange(24 * steps_per_hour)[None, :] + 0.5) / steps_per_hour
+
+    # Sun position: declination, equation of time and hour angle
+    declination = np.radians(23.45) * np.sin(2 * np.pi * (284 + day) / 365)
+    b = 2 * np.pi * (day - 81) / 364
+    equation_of_time_min = 9.87 * np.sin(2 * b) - 7.53 * np.cos(b) - 1.5 * np.sin(b)
+    solar_hour = local_hour + (4 * (longitude_deg - 15 * utc_offset_hours) + equation_of_time_min) / 60
+    hour_angle = np.radians(15 * (solar_hour - 12))
+
+    lat = np.radians(latitude_deg)
+    tilt = np.radians(tilt_deg)
+    surface_azimuth = np.radians(azimuth_deg - 180)  # measured from south, west positive
+
+    cos_zenith = np.sin(lat) * np.sin(declination) + np.cos(lat) * np.cos(declination) * np.cos(hour_angle)
+    cos_incidence = (np.sin(declination) * np.sin(lat) * np.cos(tilt)
+                     - np.sin(declination) * np.cos(lat) * np.sin(tilt) * np.cos(surface_azimuth)
+                     + np.cos(declination) * np.cos(lat) * np.cos(tilt) * np.cos(hour_angle)
+                     + np.cos(declination) * np.sin(lat) * np.sin(tilt) * np.cos(surface_azimuth) * np.cos(hour_angle)
+                     + np.cos(declination) * np.sin(tilt) * np.sin(surface_azimuth) * np.sin(hour_angle))
+
+    # Clear sky: Kasten-Young air mass, Meinel direct beam, diffuse ~10 % of beam
+    sun_up = cos_zenith > 0
+    zenith_deg = np.degrees(np.arccos(np.clip(cos_zenith, -1.0, 1.0)))
+    air_mass = np.where(sun_up, 1.0 / (np.maximum(cos_zenith, 0.0) + 0.50572 * np.maximum(96.07995 - zenith_deg, 1e-3) ** -1.6364), np.inf)
+    dni = np.where(sun_up, 1353.0 * 0.7 ** (air_mass ** 0.678), 0.0)
+    dhi = 0.1 * dni * np.maximum(cos_zenith, 0.0)
+    ghi = 1.1 * dni * np.maximum(cos_zenith, 0.0)
+
+    poa = (dni * np.maximum(cos_incidence, 0.0)
+           + dhi * (1 + np.cos(tilt)) / 2
+           + ghi * albedo * (1 - np.cos(tilt)) / 2)
+    table = np.where(sun_up, poa, 0.0)
+    table.setflags(write=False)
+    return table
+
+
+class SolarModel:
+    """
+    Clear-sky solar output for one site and panel orientation, backed by precomputed tables.
+
+    Sun position and irradiance are computed once per (site, tilt, azimuth, time step) for the
+    whole year and cached. Energy queries integrate a cumulative table, so the energy over any
+    interval costs the same regardless of its length and works on arrays of intervals or poles.
+    Defaults describe a south-facing panel in Riyadh.
+    """
+
+    def __init__(self, latitude_deg: float = 24.7, longitude_deg: float = 46.7, utc_offset_hours: float = 3.0,
+                 tilt_deg: float = None, azimuth_deg: float = None, derating: float = 0.8, albedo: float = 0.2,
+                 steps_per_hour: int = 4):
+        """
+        :param latitude_deg: Site latitude, north positive
+        :param longitude_deg: Site longitude, east positive
+        :param utc_offset_hours: Local standard time offset from UTC
+        :param tilt_deg: Panel tilt from horizontal (default: |latitude|)
+        :param azimuth_deg: Compass direction the panel faces (default: towards the equator)
+        :param derating: Combined losses (temperature, soiling, wiring, charge controller)
+        :param albedo: Ground reflectance
+        :param steps_per_hour: Table resolution
+        """
+        self.latitude_deg = latitude_deg
+        self.longitude_deg = longitude_deg
+        self.utc_offset_hours = utc_offset_hours
+        self.tilt_deg = tilt_deg if tilt_deg is not None else abs(latitude_deg)
+        self.azimuth_deg = azimuth_deg if azimuth_deg is not None else (180.0 if latitude_deg >= 0 else 0.0)
+        self.derating = derating
+        self.albedo = albedo
+        self.steps_per_hour = steps_per_hour
+
+        self.table = _irradiance_table(latitude_deg, longitude_deg, utc_offset_hours, self.tilt_deg,
+                                       self.azimuth_deg, albedo, steps_per_hour)
+        # Output per watt of panel rating, and its running integral in Wh per W over the year
+        self._fraction = self.table.ravel() / 1000.0 * derating
+        self._cumulative = np.concatenate([[0.0], np.cumsum(self._fraction) / steps_per_hour])
+        self._year_total = self._cumulative[-1]
+
+    def hour_of_year_now(self) -> float:
+        """
+        Current hour of the year in the site's local standard time.
+        """
+        now = time.gmtime(time.time() + self.utc_offset_hours * 3600)
+        return ((now.tm_yday - 1) % DAYS_PER_YEAR) * 24 + now.tm_hour + now.tm_min / 60 + now.tm_sec / 3600
+
+    def output_fraction(self, hour_of_year):
+        """
+        Panel output as a fraction of its rated watts at the given hour(s) of the year.
+        """
+        index = (np.floor(np.asarray(hour_of_year, dtype=float) * self.steps_per_hour).astype(np.int64)
+                 % len(self._fraction))
+        return self._fraction[index]
+
+    def _integral(self, hour_of_year: np.ndarray) -> np.ndarray:
+        """
+        Wh per rated W produced from the start of the year up to hour_of_year (may exceed one year).
+        """
+        years, hour = np.divmod(hour_of_year, HOURS_PER_YEAR)
+        position = hour * self.steps_per_hour
+        return years * self._year_total + np.interp(position, np.arange(len(self._cumulative)), self._cumulative)
+
+    def energy_wh(self, panel_watts, start_hour_of_year, duration_hours):
+        """
+        Energy produced over [start, start + duration). Works elementwise on arrays.
+        :param panel_watts: Rated panel output in watts
+        :param start_hour_of_year: Interval start in hours since Jan 1 00:00 local standard time
+        :param duration_hours: Interval length in hours
+        """
+        start = np.asarray(start_hour_of_year, dtype=float)
+        end = start + np.asarray(duration_hours, dtype=float)
+        return np.asarray(panel_watts, dtype=float) * (self._integral(end) - self._integral(start))
+
+
+def simulate_energy_balance(models: List[SolarModel], site_index: Sequence[int], panel_watts, load_watts,
+                            battery_capacity_wh, hours: int = HOURS_PER_YEAR, step_hours: float = 1.0,
+                            start_hour_of_year: float = 0.0, initial_fraction: float = 1.0) -> Dict[str, np.ndarray]:
+    """
+    Year-long battery energy balance for many poles at once.
+
+    Solar energy per step is precomputed for every site, then each step updates all poles'
+    batteries with a few array operations, matching PowerInterface's charge/consume clamping.
+
+    :param models: One SolarModel per distinct site/orientation
+    :param site_index: For each pole, index into models
+    :param panel_watts: Rated panel watts per pole (scalar or array)
+    :param load_watts: Average load per pole (scalar or array)
+    :param battery_capacity_wh: Battery capacity per pole (scalar or array)
+    :param hours: Simulated span in hours
+    :param step_hours: Step length in hours
+    :param start_hour_of_year: Start of the simulation
+    :param initial_fraction: Starting state of charge
+    """
+    site_index = np.asarray(site_index, dtype=np.int64)
+    n = len(site_index)
+    panel_watts = np.broadcast_to(np.asarray(panel_watts, dtype=float), (n,))
+    load_wh = np.broadcast_to(np.asarray(load_watts, dtype=float), (n,)) * step_hours
+    capacity = np.broadcast_to(np.asarray(battery_capacity_wh, dtype=float), (n,))
+
+    steps = int(round(hours / step_hours))
+    starts = start_hour_of_year + np.arange(steps) * step_hours
+    # Wh per rated W for each site and step, shape (sites, steps)
+    site_energy = np.stack([model.energy_wh(1.0, starts, step_hours) for model in models])
+
+    battery = capacity * initial_fraction
+    generated = np.zeros(n)
+    unmet = np.zeros(n)
+    curtailed = np.zeros(n)
+    empty_steps = np.zeros(n, dtype=np.int64)
+    for step in range(steps):
+        produced = site_energy[site_index, step] * panel_watts
+        generated += produced
+        charged = battery + produced
+        curtailed += np.maximum(charged - capacity, 0.0)
+        battery = np.minimum(charged, capacity)
+        drawn = battery - load_wh
+        unmet += np.maximum(-drawn, 0.0)
+        battery = np.maximum(drawn, 0.0)
+        empty_steps += battery <= 0.0
+
+    return {
+        "battery_level_wh": battery,
+        "generated_wh": generated,
+        "unmet_load_wh": unmet,
+        "curtailed_wh": curtailed,
+        "empty_hours": empty_steps * step_hours
+    }
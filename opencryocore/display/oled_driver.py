@@ -1,10 +1,7 @@
 # File: /opencryocore/display/oled_driver.py
 
 import time
-import board
-import busio
 from PIL import Image, ImageDraw, ImageFont
-import adafruit_ssd1306
 
 
 class OLEDStatusDisplay:
@@ -13,14 +10,21 @@ class OLEDStatusDisplay:
     Compatible with SSD1306 displays via Adafruit driver and CircuitPython.
     """
 
-    def __init__(self, get_status_callback, i2c_address=0x3C):
+    def __init__(self, get_status_callback, i2c_address=0x3C, display=None):
         """
         :param get_status_callback: Function that returns a dict of system values
         :param i2c_address: I2C address of the OLED screen (default 0x3C)
+        :param display: Already opened SSD1306-compatible display (fill/image/show); opened on I2C when omitted
         """
         self.get_status = get_status_callback
-        self.i2c = busio.I2C(board.SCL, board.SDA)
-        self.display = adafruit_ssd1306.SSD1306_I2C(128, 64, self.i2c, addr=i2c_address)
+        if display is None:
+            # Board libraries only exist on the Pi, so they are imported when the screen is opened
+            import board
+            import busio
+            import adafruit_ssd1306
+            self.i2c = busio.I2C(board.SCL, board.SDA)
+            display = adafruit_ssd1306.SSD1306_I2C(128, 64, self.i2c, addr=i2c_address)
+        self.display = display
         self.display.fill(0)
         self.display.show()
 
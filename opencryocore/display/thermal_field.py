@@ -0,0 +1,264 @@
+# File: /opencryocore/display/thermal_field.py
+
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from PIL import Image
+
+FT_TO_M = 0.3048
+
+
+def pole_from_environment(pole_id: str, x_m: float, y_m: float, environment_sim, ambient_temp_c: float = None) -> dict:
+    """
+    Builds a field pole from a pole's EnvironmentSim: its radius and the drop it currently achieves.
+    """
+    ambient_temp_c = ambient_temp_c if ambient_temp_c is not None else environment_sim.initial_temp_c
+    return {
+        "pole_id": pole_id,
+        "x_m": x_m,
+        "y_m": y_m,
+        "radius_ft": environment_sim.radius_ft,
+        "drop_c": max(ambient_temp_c - environment_sim.current_temp_c, 0.0)
+    }
+
+
+class ThermalFieldRenderer:
+    """
+    Rasterizes the combined cooling effect of many poles into a 2D temperature grid.
+
+    Each pole contributes a Gaussian footprint (sigma proportional to its cooling radius) scaled
+    by the temperature drop it achieves. Poles are splatted onto impulse grids, one per radius
+    class, and convolved with that class's kernel via FFT, so the cost depends on grid size and
+    not on the number of poles. Later changes to individual poles are applied by stamping the
+    kernel locally instead of redoing the FFT.
+    """
+
+    def __init__(self, bounds_m: Tuple[float, float, float, float], ambient_temp_c: float = 46.0,
+                 max_zoom: int = 2, tile_size: int = 256, sigma_per_radius: float = 0.5):
+        """
+        :param bounds_m: (min_x, min_y, max_x, max_y) of the area in meters; the longer side sets the scale
+        :param ambient_temp_c: Uncooled ambient temperature
+        :param max_zoom: Deepest tile zoom level; the grid is tile_size * 2**max_zoom pixels square
+        :param tile_size: Tile edge in pixels
+        :param sigma_per_radius: Footprint sigma as a fraction of the pole's cooling radius
+        """
+        self.min_x, self.min_y = bounds_m[0], bounds_m[1]
+        self.ambient_temp_c = ambient_temp_c
+        self.max_zoom = max_zoom
+        self.tile_size = tile_size
+        self.size = tile_size * 2 ** max_zoom
+        self.meters_per_pixel = max(bounds_m[2] - bounds_m[0], bounds_m[3] - bounds_m[1]) / self.size
+        self.sigma_per_radius = sigma_per_radius
+
+        self.drop = np.zeros((self.size, self.size))
+        self.poles: Dict[str, dict] = {}
+        self._kernels: Dict[float, np.ndarray] = {}
+
+    def _radius_class(self, radius_ft: float) -> float:
+        return round(radius_ft * 2) / 2  # half-foot classes
+
+    def _kernel(self, radius_ft: float) -> np.ndarray:
+        """
+        Peak-normalized Gaussian footprint for a radius class, truncated at 3 sigma.
+        """
+        radius_ft = self._radius_class(radius_ft)
+        if radius_ft not in self._kernels:
+            sigma_px = max(radius_ft * FT_TO_M * self.sigma_per_radius / self.meters_per_pixel, 0.5)
+            half = int(np.ceil(3 * sigma_px))
+            offsets = np.arange(-half, half + 1)
+            profile = np.exp(-offsets ** 2 / (2 * sigma_px ** 2))
+            self._kernels[radius_ft] = np.outer(profile, profile)
+        return self._kernels[radius_ft]
+
+    def _pixel(self, pole: dict) -> Tuple[int, int]:
+        row = int(round((pole["y_m"] - self.min_y) / self.meters_per_pixel))
+        col = int(round((pole["x_m"] - self.min_x) / self.meters_per_pixel))
+        return row, col
+
+    def footprint_box(self, pole: dict) -> Tuple[int, int, int, int]:
+        """
+        Pixel box (row0, col0, row1, col1), clipped to the grid, touched by a pole's footprint.
+        """
+        half = self._kernel(pole["radius_ft"]).shape[0] // 2
+        row, col = self._pixel(pole)
+        return (max(row - half, 0), max(col - half, 0), min(row + half + 1, self.size), min(col + half + 1, self.size))
+
+    def set_poles(self, poles: Iterable[dict]):
+        """
+        Replaces all poles and recomputes the field with one FFT convolution per radius class.
+        """
+        self.poles = {pole["pole_id"]: dict(pole) for pole in poles}
+        self.drop = np.zeros((self.size, self.size))
+
+        by_class: Dict[float, List[dict]] = {}
+        for pole in self.poles.values():
+            by_class.setdefault(self._radius_class(pole["radius_ft"]), []).append(pole)
+
+        for radius_ft, members in by_class.items():
+            kernel = self._kernel(radius_ft)
+            half = kernel.shape[0] // 2
+            # Pad by the kernel half-width on every side so poles just outside still count and nothing wraps
+            padded = self.size + 2 * half
+            impulses = np.zeros((padded, padded))
+            rows, cols, drops = [], [], []
+            for pole in members:
+                row, col = self._pixel(pole)
+                if -half <= row < self.size + half and -half <= col < self.size + half:
+                    rows.append(row + half)
+                    cols.append(col + half)
+                    drops.append(pole["drop_c"])
+            if not drops:
+                continue
+            np.add.at(impulses, (np.array(rows), np.array(cols)), np.array(drops))
+
+            shape = (padded + kernel.shape[0] - 1,) * 2
+            spectrum = np.fft.rfft2(impulses, shape) * np.fft.rfft2(kernel, shape)
+            convolved = np.fft.irfft2(spectrum, shape)
+            self.drop += convolved[2 * half:2 * half + self.size, 2 * half:2 * half + self.size]
+
+        np.maximum(self.drop, 0.0, out=self.drop)  # FFT round-off can leave tiny negatives
+        print(f"[ThermalField] Rendered {len(self.poles)} poles in {len(by_class)} radius classes.")
+
+    def _stamp(self, pole: dict, sign: float):
+        kernel = self._kernel(pole["radius_ft"])
+        half = kernel.shape[0] // 2
+        row, col = self._pixel(pole)
+        r0, c0, r1, c1 = self.footprint_box(pole)
+        if r0 >= r1 or c0 >= c1:
+            return
+        patch = kernel[r0 - row + half:r1 - row + half, c0 - col + half:c1 - col + half]
+        self.drop[r0:r1, c0:c1] += sign * pole["drop_c"] * patch
+
+    def update_poles(self, poles: Iterable[dict]) -> List[Tuple[int, int, int, int]]:
+        """
+        Applies changed, added or moved poles incrementally.
+        :return: Pixel boxes whose temperatures changed
+        """
+        dirty = []
+        for pole in poles:
+            old = self.poles.get(pole["pole_id"])
+            if old == pole:
+                continue
+            if old is not None:
+                self._stamp(old, -1.0)
+                dirty.append(self.footprint_box(old))
+            self._stamp(pole, 1.0)
+            dirty.append(self.footprint_box(pole))
+            self.poles[pole["pole_id"]] = dict(pole)
+        if dirty:
+            np.maximum(self.drop, 0.0, out=self.drop)
+        return dirty
+
+    def remove_poles(self, pole_ids: Iterable[str]) -> List[Tuple[int, int, int, int]]:
+        dirty = []
+        for pole_id in pole_ids:
+            old = self.poles.pop(pole_id, None)
+            if old is not None:
+                self._stamp(old, -1.0)
+                dirty.append(self.footprint_box(old))
+        if dirty:
+            np.maximum(self.drop, 0.0, out=self.drop)
+        return dirty
+
+    def temperature_grid(self) -> np.ndarray:
+        """
+        Zone temperature in °C for every pixel. Row 0 is min_y.
+        """
+        return self.ambient_temp_c - self.drop
+
+
+class ThermalTileCache:
+    """
+    Serves the rendered field as zoomable PNG map tiles from an LRU cache.
+
+    Zoom 0 is the whole area in one tile; zoom z splits it into 2**z by 2**z tiles. When poles
+    change, only tiles overlapping their footprints are evicted. The colour scale is fixed so
+    unchanged tiles stay valid. Syncing, rendering and eviction hold `lock`, so the cache can be
+    shared by threaded web request handlers; hold it too when reading the renderer directly.
+    """
+
+    def __init__(self, renderer: ThermalFieldRenderer, max_tiles: int = 256, min_temp_c: float = None,
+                 max_temp_c: float = None):
+        """
+        :param renderer: Field renderer supplying the temperature grid
+        :param max_tiles: Number of encoded tiles kept in memory
+        :param min_temp_c: Temperature mapped to the coldest colour (default ambient - 5 °C)
+        :param max_temp_c: Temperature mapped to the hottest colour (default ambient)
+        """
+        self.renderer = renderer
+        self.max_tiles = max_tiles
+        self.min_temp_c = min_temp_c if min_temp_c is not None else renderer.ambient_temp_c - 5.0
+        self.max_temp_c = max_temp_c if max_temp_c is not None else renderer.ambient_temp_c
+        self.tiles: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def get_tile(self, zoom: int, x: int, y: int) -> bytes:
+        """
+        Returns the PNG for tile (zoom, x, y), rendering it on a cache miss.
+        """
+        if not 0 <= zoom <= self.renderer.max_zoom or not (0 <= x < 2 ** zoom and 0 <= y < 2 ** zoom):
+            raise ValueError(f"Tile ({zoom}, {x}, {y}) out of range")
+        key = (zoom, x, y)
+        with self.lock:
+            if key in self.tiles:
+                self.tiles.move_to_end(key)
+                self.hits += 1
+                return self.tiles[key]
+
+            self.misses += 1
+            png = self._render_tile(zoom, x, y)
+            self.tiles[key] = png
+            while len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+            return png
+
+    def _render_tile(self, zoom: int, x: int, y: int) -> bytes:
+        size = self.renderer.tile_size
+        span = self.renderer.size // 2 ** zoom
+        factor = span // size
+        # Tile y grows northwards in the grid; images grow downwards, so flip rows
+        block = self.renderer.drop[y * span:(y + 1) * span, x * span:(x + 1) * span]
+        block = block.reshape(size, factor, size, factor).mean(axis=(1, 3))[::-1]
+        temp = self.renderer.ambient_temp_c - block
+
+        scale = np.clip((temp - self.min_temp_c) / (self.max_temp_c - self.min_temp_c), 0.0, 1.0)
+        rgb = np.stack([scale * 255, 64 + 64 * (1 - np.abs(2 * scale - 1)), (1 - scale) * 255], axis=-1)
+        buffer = io.BytesIO()
+        Image.fromarray(rgb.astype(np.uint8), mode="RGB").save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def invalidate_boxes(self, boxes: Iterable[Tuple[int, int, int, int]]) -> int:
+        """
+        Evicts every cached tile overlapping one of the pixel boxes.
+        :return: Number of tiles evicted
+        """
+        evicted = 0
+        with self.lock:
+            for zoom, x, y in list(self.tiles):
+                span = self.renderer.size // 2 ** zoom
+                for r0, c0, r1, c1 in boxes:
+                    if r0 < (y + 1) * span and r1 > y * span and c0 < (x + 1) * span and c1 > x * span:
+                        del self.tiles[(zoom, x, y)]
+                        evicted += 1
+                        break
+        return evicted
+
+    def sync_poles(self, poles: Iterable[dict]) -> int:
+        """
+        Brings the renderer up to date with the given poles (the full current set) and evicts affected tiles.
+        :return: Number of tiles evicted
+        """
+        poles = list(poles)
+        current_ids = {pole["pole_id"] for pole in poles}
+        with self.lock:
+            boxes = self.renderer.remove_poles([pid for pid in self.renderer.poles if pid not in current_ids])
+            boxes += self.renderer.update_poles(poles)
+            return self.invalidate_boxes(boxes) if boxes else 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"cached_tiles": len(self.tiles), "hits": self.hits, "misses": self.misses}
@@ -1,5 +1,7 @@
 # File: /opencryocore/display/touch_ui.py
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
 from typing import Optional
@@ -8,26 +10,49 @@ class CryoCoreUI:
     """
     A simple touch-friendly GUI using Tkinter for monitoring a CryoCore or HyperPole system.
     Displays status, temperatures, and control buttons for Raspberry Pi with touchscreen.
+
+    Status is fetched on a background worker thread and handed to the Tk main loop through a
+    queue, so a slow status callback never blocks touch input; shutdown runs off the Tk thread
+    the same way. Labels are only reconfigured when their rendered text changes. The per-unit
+    grid scrolls inside the space left above the shutdown button, which always stays visible.
     """
 
-    def __init__(self, cluster_status_func, shutdown_func, refresh_interval_ms: int = 1000):
+    STATUS_KEYS = ["cluster_id", "operational", "ambient_temp_c"]
+    UNIT_COLUMNS = ["Unit", "Fan RPM", "Piston W"]
+
+    def __init__(self, cluster_status_func, shutdown_func, refresh_interval_ms: int = 1000,
+                 poll_interval_ms: int = 16, start_worker: bool = True):
         """
         :param cluster_status_func: Callable that returns the current system status as a dict
         :param shutdown_func: Callable to initiate system shutdown
-        :param refresh_interval_ms: How often to refresh UI in milliseconds
+        :param refresh_interval_ms: How often the worker fetches a new status in milliseconds
+        :param poll_interval_ms: How often the Tk loop checks for new snapshots (16 ms ≈ 60 fps)
+        :param start_worker: Fetch status on a background thread; pass False to drive the UI with refresh()
         """
         self.root = tk.Tk()
         self.cluster_status_func = cluster_status_func
         self.shutdown_func = shutdown_func
         self.refresh_interval_ms = refresh_interval_ms
+        self.poll_interval_ms = poll_interval_ms
         self.status_labels = {}
+        self.unit_labels = {}
+        self._unit_ids = []
+        self._rendered_text = {}
+
+        # Only the newest snapshot matters, older ones are dropped by the worker
+        self._status_queue: "queue.Queue[dict]" = queue.Queue(maxsize=1)
+        self._shutdown_results: "queue.Queue[Optional[Exception]]" = queue.Queue()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
 
         self.root.title("CryoCore System Monitor")
         self.root.geometry("480x320")  # Typical Raspberry Pi touch resolution
         self.root.configure(bg="#111")
 
         self._build_ui()
-        self._schedule_refresh()
+        if start_worker:
+            self._start_worker()
+            self._schedule_poll()
 
     def _build_ui(self):
         header = tk.Label(self.root, text="CryoCore HyperPole", font=("Arial", 20, "bold"), bg="#111", fg="#0ff")
@@ -36,36 +61,177 @@ class CryoCoreUI:
         self.status_frame = tk.Frame(self.root, bg="#111")
         self.status_frame.pack(pady=5)
 
-        for key in ["cluster_id", "operational", "ambient_temp_c"]:
+        for key in self.STATUS_KEYS:
             label = tk.Label(self.status_frame, text=f"{key}: ---", font=("Arial", 14), bg="#111", fg="#eee")
             label.pack()
             self.status_labels[key] = label
+            self._rendered_text[("status", key)] = f"{key}: ---"
 
-        self.unit_frame = tk.Frame(self.root, bg="#111")
-        self.unit_frame.pack(pady=5)
-
+        # Packed before the unit grid so it keeps its space however many units there are
         self.shutdown_button = ttk.Button(self.root, text="Shutdown System", command=self._on_shutdown)
-        self.shutdown_button.pack(pady=10)
+        self.shutdown_button.pack(side="bottom", pady=10)
+
+        unit_area = tk.Frame(self.root, bg="#111")
+        unit_area.pack(fill="both", expand=True, padx=10)
+        self.unit_canvas = tk.Canvas(unit_area, bg="#111", highlightthickness=0)
+        scrollbar = tk.Scrollbar(unit_area, orient="vertical", command=self.unit_canvas.yview, width=24)
+        self.unit_canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.unit_canvas.pack(side="left", fill="both", expand=True)
+
+        self.unit_frame = tk.Frame(self.unit_canvas, bg="#111")
+        self.unit_canvas.create_window((0, 0), window=self.unit_frame, anchor="nw")
+        self.unit_frame.bind("<Configure>",
+                             lambda event: self.unit_canvas.configure(scrollregion=self.unit_canvas.bbox("all")))
+
+    def _build_unit_grid(self, unit_ids):
+        """
+        (Re)creates the per-unit grid. Only called when the set of units changes.
+        """
+        for child in self.unit_frame.winfo_children():
+            child.destroy()
+        self.unit_labels = {}
+        self._rendered_text = {k: v for k, v in self._rendered_text.items() if k[0] != "unit"}
+
+        for col, title in enumerate(self.UNIT_COLUMNS):
+            tk.Label(self.unit_frame, text=title, font=("Arial", 10, "bold"), bg="#111", fg="#0ff") \
+                .grid(row=0, column=col, padx=4)
+
+        for row, unit_id in enumerate(unit_ids, start=1):
+            for col in range(len(self.UNIT_COLUMNS)):
+                label = tk.Label(self.unit_frame, text="---", font=("Arial", 10), bg="#111", fg="#eee")
+                label.grid(row=row, column=col, padx=4)
+                self.unit_labels[(unit_id, col)] = label
+                self._rendered_text[("unit", unit_id, col)] = "---"
+
+        self._unit_ids = list(unit_ids)
 
     def _on_shutdown(self):
-        self.shutdown_func()
-        for label in self.status_labels.values():
-            label.config(text="---")
+        self.shutdown_button.state(["disabled"])
+        threading.Thread(target=self._shutdown_worker, daemon=True).start()
+
+    def _shutdown_worker(self):
+        """
+        Runs the shutdown callback off the Tk thread and reports the outcome to the poll loop.
+        """
+        try:
+            self.shutdown_func()
+            self._shutdown_results.put(None)
+        except Exception as e:
+            self._shutdown_results.put(e)
+
+    def _on_shutdown_done(self, error: Optional[Exception]):
+        self.shutdown_button.state(["!disabled"])
+        if error is not None:
+            print(f"[UI] Shutdown failed: {error}")
+            return
+        for key, label in self.status_labels.items():
+            self._set_text(("status", key), label, "---")
+        for (unit_id, col), label in self.unit_labels.items():
+            self._set_text(("unit", unit_id, col), label, "---")
         print("[UI] Shutdown initiated.")
 
-    def _schedule_refresh(self):
-        self._update_status()
-        self.root.after(self.refresh_interval_ms, self._schedule_refresh)
+    def _start_worker(self):
+        self._worker = threading.Thread(target=self._status_worker, daemon=True)
+        self._worker.start()
+
+    def _status_worker(self):
+        """
+        Background loop: fetch status and publish the newest snapshot to the Tk thread.
+        """
+        while not self._stop_event.is_set():
+            try:
+                status = self.cluster_status_func()
+            except Exception as e:
+                print(f"[UI] Status fetch failed: {e}")
+                status = None
+
+            if status:
+                try:
+                    self._status_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._status_queue.put_nowait(status)
+
+            self._stop_event.wait(self.refresh_interval_ms / 1000.0)
+
+    def _schedule_poll(self):
+        self._poll_status_queue()
+        if not self._stop_event.is_set():
+            self.root.after(self.poll_interval_ms, self._schedule_poll)
+
+    def _poll_status_queue(self):
+        try:
+            self._on_shutdown_done(self._shutdown_results.get_nowait())
+        except queue.Empty:
+            pass
+        try:
+            status = self._status_queue.get_nowait()
+        except queue.Empty:
+            return
+        self._update_status(status)
+
+    def _set_text(self, cache_key, label, text: str):
+        """
+        Reconfigures a label only when its text actually changes.
+        """
+        if self._rendered_text.get(cache_key) == text:
+            return
+        label.config(text=text)
+        self._rendered_text[cache_key] = text
+
+    @staticmethod
+    def _format(value) -> str:
+        if value is None:
+            return "---"
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
 
-    def _update_status(self):
-        status = self.cluster_status_func()
+    def _update_status(self, status: dict):
         if not status:
             return
-        for key in ["cluster_id", "operational", "ambient_temp_c"]:
-            value = status.get(key, "---")
-            if isinstance(value, float):
-                value = f"{value:.2f}"
-            self.status_labels[key].config(text=f"{key}: {value}")
+
+        zone_temp = status.get("ambient_temp_c")
+        if zone_temp is None:
+            zone_temp = status.get("environment", {}).get("current_temp_c")
+
+        for key in self.STATUS_KEYS:
+            value = zone_temp if key == "ambient_temp_c" else status.get(key, "---")
+            self._set_text(("status", key), self.status_labels[key], f"{key}: {self._format(value)}")
+
+        units = status.get("cluster_status", {}).get("units_status", [])
+        unit_ids = [unit.get("unit_id") for unit in units]
+        if unit_ids != self._unit_ids:
+            self._build_unit_grid(unit_ids)
+
+        for unit in units:
+            unit_id = unit.get("unit_id")
+            values = [
+                unit_id,
+                unit.get("fan_status", {}).get("current_rpm"),
+                unit.get("power_output"),
+            ]
+            for col, value in enumerate(values):
+                self._set_text(("unit", unit_id, col), self.unit_labels[(unit_id, col)], self._format(value))
+
+    def refresh(self, status: dict = None):
+        """
+        Fetches (unless given) and renders one status snapshot on the calling thread, then
+        processes pending Tk redraws. For driving the UI without the worker, e.g. in soak runs.
+        """
+        self._update_status(status if status is not None else self.cluster_status_func())
+        self.root.update_idletasks()
+
+    def stop(self):
+        """
+        Stops the status worker and closes the window.
+        """
+        self._stop_event.set()
+        self.root.quit()
 
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self._stop_event.set()
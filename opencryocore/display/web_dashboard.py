@@ -1,11 +1,22 @@
 # File: /opencryocore/display/web_dashboard.py
 
-from flask import Flask, jsonify, render_template
+from flask import Flask, Response, jsonify, render_template, request
 from opencryocore.control.core_controller import CryoCoreController
+from opencryocore.core.response_surface import ResponseSurface
+from opencryocore.display.thermal_field import ThermalFieldRenderer, ThermalTileCache, pole_from_environment
 import threading
 
 app = Flask(__name__)
 controller = CryoCoreController(cluster_id="default_cluster")
+response_surface = None
+response_surface_lock = threading.Lock()
+
+# Heatmap of the deployment; this dashboard serves a single pole at the origin
+field_tiles = ThermalTileCache(ThermalFieldRenderer(bounds_m=(-10, -10, 10, 10),
+                                                    ambient_temp_c=controller.environment_sim.initial_temp_c))
+
+def field_poles():
+    return [pole_from_environment(controller.cluster_id, 0.0, 0.0, controller.environment_sim)]
 
 # Run controller in separate thread to keep web server responsive
 def start_controller():
@@ -24,5 +35,57 @@ def status():
     status_data = controller.get_status()
     return jsonify(status_data)
 
+@app.route('/what_if')
+def what_if():
+    """
+    Planner query, e.g. /what_if?ambient_temp_c=46&power_watts=40&unit_count=9&radius_ft=9&height_ft=20
+    """
+    global response_surface
+    with response_surface_lock:
+        # Flask serves requests on threads; build or load the table only once
+        if response_surface is None:
+            response_surface = ResponseSurface().load_or_build()
+    try:
+        result = response_surface.query(
+            ambient_temp_c=float(request.args.get('ambient_temp_c', 46.0)),
+            power_watts=float(request.args.get('power_watts', 40.0)),
+            unit_count=float(request.args.get('unit_count', 9)),
+            radius_ft=float(request.args.get('radius_ft', 9.0)),
+            height_ft=float(request.args.get('height_ft', 20.0))
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result)
+
+@app.route('/field/info')
+def field_info():
+    with field_tiles.lock:
+        field_tiles.sync_poles(field_poles())
+        renderer = field_tiles.renderer
+        grid = renderer.temperature_grid()
+        pole_count = len(renderer.poles)
+    return jsonify({
+        "bounds_m": [renderer.min_x, renderer.min_y,
+                     renderer.min_x + renderer.size * renderer.meters_per_pixel,
+                     renderer.min_y + renderer.size * renderer.meters_per_pixel],
+        "max_zoom": renderer.max_zoom,
+        "tile_size": renderer.tile_size,
+        "pole_count": pole_count,
+        "min_temp_c": round(float(grid.min()), 2),
+        "mean_temp_c": round(float(grid.mean()), 2),
+        "cache": field_tiles.stats()
+    })
+
+@app.route('/field/tiles/<int:zoom>/<int:x>/<int:y>.png')
+def field_tile(zoom, x, y):
+    try:
+        with field_tiles.lock:
+            # Sync and render together so no request sees a half-applied pole update
+            field_tiles.sync_poles(field_poles())
+            png = field_tiles.get_tile(zoom, x, y)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    return Response(png, mimetype='image/png')
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8080)
@@ -6,13 +6,15 @@ class PowerInterface:
     Supports batteries, solar panels, and load regulation.
     """
 
-    def __init__(self, battery_capacity_wh: float = 200.0, solar_panel_watts: float = 100.0):
+    def __init__(self, battery_capacity_wh: float = 200.0, solar_panel_watts: float = 100.0, solar_model=None):
         """
         :param battery_capacity_wh: Total battery capacity in watt-hours
         :param solar_panel_watts: Peak solar panel output in watts
+        :param solar_model: Optional SolarModel; without one the panel is assumed to deliver its peak output
         """
         self.battery_capacity_wh = battery_capacity_wh
         self.solar_panel_watts = solar_panel_watts
+        self.solar_model = solar_model
         self.battery_level_wh = battery_capacity_wh
         self.load_watts = 0.0
         self.operational = False
@@ -38,14 +40,20 @@ class PowerInterface:
         self.battery_level_wh = max(self.battery_level_wh - energy_consumed, 0.0)
         print(f"[PowerInterface] Consumed {energy_consumed:.2f} Wh. Battery level: {self.battery_level_wh:.2f} Wh.")
 
-    def charge_battery(self, duration_hours: float):
+    def charge_battery(self, duration_hours: float, hour_of_year: float = None):
         """
         Charge battery using solar panel output.
         :param duration_hours: Duration in hours
+        :param hour_of_year: Start of the charging interval in local standard time; defaults to now
         """
         if not self.operational:
             return
-        energy_generated = self.solar_panel_watts * duration_hours
+        if self.solar_model is not None:
+            if hour_of_year is None:
+                hour_of_year = self.solar_model.hour_of_year_now()
+            energy_generated = float(self.solar_model.energy_wh(self.solar_panel_watts, hour_of_year, duration_hours))
+        else:
+            energy_generated = self.solar_panel_watts * duration_hours
         self.battery_level_wh = min(self.battery_level_wh + energy_generated, self.battery_capacity_wh)
         print(f"[PowerInterface] Charged {energy_generated:.2f} Wh. Battery level: {self.battery_level_wh:.2f} Wh.")
 
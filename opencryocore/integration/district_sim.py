@@ -0,0 +1,351 @@
+# File: /opencryocore/integration/district_sim.py
+
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+from typing import List, Tuple
+import numpy as np
+from opencryocore.core.environment_sim import EnvironmentSim
+from opencryocore.hardware.power_interface import PowerInterface
+
+# Planes of the shared district state, each of shape (rows, cols)
+PLANES = ["temp_a", "temp_b", "battery_wh", "ambient_temp_c", "drop_per_watt_c", "gain_c", "load_watts", "pole"]
+PLANE = {name: i for i, name in enumerate(PLANES)}
+
+# Relative cost of a grid cell vs. a pole cell, used for load balancing uneven tiles
+CELL_COST = 1.0
+POLE_COST = 4.0
+
+
+def build_district_fields(pole_mask, ambient_temp_c=46.0, power_budget_watts=360.0, radius_ft=9.0,
+                          height_ft=20.0, cycle_seconds: int = 10) -> np.ndarray:
+    """
+    Builds the district state planes from the per-pole models.
+    Every lattice cell is one EnvironmentSim cylinder; cells flagged in pole_mask carry a
+    HyperPole cluster with its own PowerInterface battery.
+
+    :param pole_mask: 2D bool array, True where a HyperPole stands
+    :param ambient_temp_c: Ambient temperature, scalar or per-cell array
+    :param power_budget_watts: Cluster power budget, scalar or per-cell array
+    :param radius_ft: Cooled zone radius, scalar or per-cell array
+    :param height_ft: Cooled zone height, scalar or per-cell array
+    :param cycle_seconds: Simulation step length in seconds
+    :return: Array of shape (len(PLANES), rows, cols)
+    """
+    pole_mask = np.asarray(pole_mask, dtype=bool)
+    shape = pole_mask.shape
+    fields = np.zeros((len(PLANES),) + shape)
+
+    ambient = np.broadcast_to(np.asarray(ambient_temp_c, dtype=float), shape)
+    radius = np.broadcast_to(np.asarray(radius_ft, dtype=float), shape)
+    height = np.broadcast_to(np.asarray(height_ft, dtype=float), shape)
+
+    # Model constants depend only on zone geometry, so evaluate each distinct geometry once
+    geometry = np.stack([radius.ravel(), height.ravel()], axis=1)
+    unique_geometry, inverse = np.unique(geometry, axis=0, return_inverse=True)
+    drop_per_watt = np.empty(len(unique_geometry))
+    gain = np.empty(len(unique_geometry))
+    for i, (r, h) in enumerate(unique_geometry):
+        env = EnvironmentSim(radius_ft=r, height_ft=h)
+        drop_per_watt[i] = env.cooling_model.compute_temp_drop(1.0, cycle_seconds)
+        gain[i] = env.cooling_model.inverse_temp_gain(env.heat_gain_watts, cycle_seconds)
+
+    fields[PLANE["temp_a"]] = ambient
+    fields[PLANE["temp_b"]] = ambient
+    fields[PLANE["battery_wh"]] = np.where(pole_mask, PowerInterface().battery_capacity_wh, 0.0)
+    fields[PLANE["ambient_temp_c"]] = ambient
+    fields[PLANE["drop_per_watt_c"]] = drop_per_watt[inverse.ravel()].reshape(shape)
+    fields[PLANE["gain_c"]] = gain[inverse.ravel()].reshape(shape)
+    fields[PLANE["load_watts"]] = np.where(pole_mask, np.broadcast_to(power_budget_watts, shape), 0.0)
+    fields[PLANE["pole"]] = pole_mask
+    return fields
+
+
+def step_rows(fields: np.ndarray, cur: int, r0: int, r1: int, pole_index: np.ndarray,
+              cycle_seconds: int, mixing_rate: float):
+    """
+    Advances rows [r0, r1) by one cycle, reading temperatures (with one halo row on each side)
+    from plane `cur` and writing into the other temperature plane.
+
+    Both the single-process and the tiled runs go through this function, so every cell sees
+    the exact same sequence of floating point operations.
+
+    :param pole_index: Flat indices (relative to the tile) of pole cells in rows [r0, r1)
+    """
+    rows, cols = fields.shape[1:]
+    src = fields[PLANE["temp_a"] + cur]
+    dst = fields[PLANE["temp_a"] + 1 - cur]
+
+    tile = src[r0:r1]
+    up = src[max(r0 - 1, 0):r1 - 1] if r0 > 0 else np.concatenate([src[:1], src[:r1 - 1]])
+    down = src[r0 + 1:r1 + 1] if r1 < rows else np.concatenate([src[r0 + 1:], src[rows - 1:]])
+    left = np.concatenate([tile[:, :1], tile[:, :-1]], axis=1)
+    right = np.concatenate([tile[:, 1:], tile[:, -1:]], axis=1)
+    neighbour_mean = (up + down + left + right) * 0.25
+
+    temp = tile.copy()
+    flat_temp = temp.reshape(-1)
+
+    # PowerInterface.consume_power + EnvironmentSim.apply_cooling, pole cells only
+    battery = fields[PLANE["battery_wh"], r0:r1].reshape(-1)
+    load = fields[PLANE["load_watts"], r0:r1].reshape(-1)[pole_index]
+    powered = battery[pole_index] > 0.0
+    battery[pole_index] = np.where(powered, np.maximum(battery[pole_index] - load * (cycle_seconds / 3600), 0.0),
+                                   battery[pole_index])
+    drop = fields[PLANE["drop_per_watt_c"], r0:r1].reshape(-1)[pole_index] * load
+    flat_temp[pole_index] = np.maximum(flat_temp[pole_index] - np.where(powered, drop, 0.0), -273.15)
+
+    # EnvironmentSim.recover_heat, then lateral mixing with neighbouring zones
+    temp = np.minimum(temp + fields[PLANE["gain_c"], r0:r1], fields[PLANE["ambient_temp_c"], r0:r1])
+    dst[r0:r1] = temp + mixing_rate * (neighbour_mean - temp)
+
+
+def district_aggregates(fields: np.ndarray, cur: int, step: int) -> dict:
+    """
+    Global figures for the whole district, computed from the full state planes.
+    """
+    pole = fields[PLANE["pole"]] > 0
+    temp = fields[PLANE["temp_a"] + cur]
+    battery = fields[PLANE["battery_wh"]][pole]
+    return {
+        "step": step,
+        "mean_temp_c": float(temp.mean()),
+        "min_temp_c": float(temp.min()),
+        "mean_pole_temp_c": float(temp[pole].mean()) if pole.any() else None,
+        "total_battery_wh": float(battery.sum()),
+        "depleted_poles": int((battery <= 0.0).sum())
+    }
+
+
+def partition_rows(fields: np.ndarray, tile_count: int) -> List[Tuple[int, int]]:
+    """
+    Splits the district into horizontal tiles of roughly equal cost.
+    Rows dense with poles cost more than empty rows, so tiles have uneven heights.
+    The split is static: pole placement, and with it the per-row cost, does not change while a district runs.
+    """
+    rows, cols = fields.shape[1:]
+    tile_count = max(1, min(tile_count, rows))
+    row_cost = cols * CELL_COST + fields[PLANE["pole"]].sum(axis=1) * POLE_COST
+    cumulative = np.cumsum(row_cost)
+    targets = cumulative[-1] * np.arange(1, tile_count) / tile_count
+    cuts = np.searchsorted(cumulative, targets, side="left") + 1
+
+    bounds = []
+    start = 0
+    for cut in list(cuts) + [rows]:
+        # Keep every tile at least one row tall
+        end = min(max(int(cut), start + 1), rows - (tile_count - len(bounds) - 1))
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _tile_pole_index(fields: np.ndarray, r0: int, r1: int) -> np.ndarray:
+    return np.flatnonzero(fields[PLANE["pole"], r0:r1].reshape(-1) > 0)
+
+
+class DistrictSim:
+    """
+    Single-process district simulation. Reference implementation for DistrictCoordinator.
+    """
+
+    def __init__(self, pole_mask, cycle_seconds: int = 10, mixing_rate: float = 0.05, **field_kwargs):
+        """
+        :param pole_mask: 2D bool array, True where a HyperPole stands
+        :param cycle_seconds: Simulation step length in seconds
+        :param mixing_rate: Fraction of the neighbour temperature difference exchanged per step
+        :param field_kwargs: Passed through to build_district_fields
+        """
+        self.cycle_seconds = cycle_seconds
+        self.mixing_rate = mixing_rate
+        self.fields = build_district_fields(pole_mask, cycle_seconds=cycle_seconds, **field_kwargs)
+        self.pole_index = _tile_pole_index(self.fields, 0, self.fields.shape[1])
+        self.cur = 0
+        self.steps_done = 0
+
+    def run(self, steps: int, aggregate_every: int = 1) -> List[dict]:
+        aggregates = []
+        rows = self.fields.shape[1]
+        for _ in range(steps):
+            step_rows(self.fields, self.cur, 0, rows, self.pole_index, self.cycle_seconds, self.mixing_rate)
+            self.cur = 1 - self.cur
+            self.steps_done += 1
+            if self.steps_done % aggregate_every == 0:
+                aggregates.append(district_aggregates(self.fields, self.cur, self.steps_done))
+        return aggregates
+
+    def temperatures(self) -> np.ndarray:
+        return self.fields[PLANE["temp_a"] + self.cur].copy()
+
+
+def _tile_worker(shm_name: str, shape, r0: int, r1: int, cycle_seconds: int, mixing_rate: float,
+                 command, start, done, step_barrier, step_timeout_sec: float):
+    """
+    Worker process owning rows [r0, r1). Halo rows are read directly from the neighbours'
+    region of the shared double buffer; the step barrier guarantees they are complete.
+
+    The worker takes one `start` token per batch and returns one `done` token when it finishes.
+    On an error it aborts the step barrier so its neighbours stop waiting, and exits.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    fields = None
+    parent = mp.parent_process()
+    try:
+        fields = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        pole_index = _tile_pole_index(fields, r0, r1)
+        while True:
+            # Idle until the next batch, but give up if the coordinator is gone
+            while not start.acquire(timeout=1.0):
+                if parent is not None and not parent.is_alive():
+                    return
+            steps, cur = command[0], command[1]
+            if steps <= 0:
+                break
+            for _ in range(steps):
+                step_rows(fields, cur, r0, r1, pole_index, cycle_seconds, mixing_rate)
+                cur = 1 - cur
+                step_barrier.wait(step_timeout_sec)
+            done.release()
+    except BrokenBarrierError:
+        pass  # a neighbouring tile failed; the coordinator sees this worker exit
+    except BaseException:
+        step_barrier.abort()
+        raise
+    finally:
+        del fields
+        shm.close()
+
+
+class DistrictCoordinator:
+    """
+    Runs the district simulation across worker processes, one per spatial tile.
+
+    The full state lives in one shared-memory block with a double-buffered temperature field.
+    Each step every worker reads its tile plus halo rows from the current buffer and writes
+    the next one; a barrier between steps replaces explicit halo messages. The coordinator
+    only hands out batches of `aggregate_every` steps and collects global aggregates between
+    them, and results are bit-identical to DistrictSim.
+
+    Tiles are balanced once, up front, by pole density (see partition_rows); there is no
+    rebalancing while the simulation runs. The coordinator waits on plain semaphores with a
+    timeout and checks that every worker is alive, so a worker that raises, is killed or
+    stalls makes run() stop all workers and raise RuntimeError instead of hanging.
+    """
+
+    def __init__(self, pole_mask, worker_count: int = None, cycle_seconds: int = 10,
+                 mixing_rate: float = 0.05, step_timeout_sec: float = 30.0, **field_kwargs):
+        """
+        :param pole_mask: 2D bool array, True where a HyperPole stands
+        :param worker_count: Number of worker processes (defaults to CPU count)
+        :param cycle_seconds: Simulation step length in seconds
+        :param mixing_rate: Fraction of the neighbour temperature difference exchanged per step
+        :param step_timeout_sec: Longest a single step may take before the run is declared failed
+        :param field_kwargs: Passed through to build_district_fields
+        """
+        self.cycle_seconds = cycle_seconds
+        self.mixing_rate = mixing_rate
+        self.step_timeout_sec = step_timeout_sec
+        initial = build_district_fields(pole_mask, cycle_seconds=cycle_seconds, **field_kwargs)
+        self.tiles = partition_rows(initial, worker_count or mp.cpu_count())
+
+        self._shm = shared_memory.SharedMemory(create=True, size=initial.nbytes)
+        self.fields = np.ndarray(initial.shape, dtype=np.float64, buffer=self._shm.buf)
+        self.fields[:] = initial
+
+        self._command = mp.Array("q", 2, lock=False)
+        self._start = mp.Semaphore(0)
+        self._done = mp.Semaphore(0)
+        self._step_barrier = mp.Barrier(len(self.tiles))
+        self._workers: List[mp.Process] = []
+        self.cur = 0
+        self.steps_done = 0
+
+    def start(self):
+        print(f"[DistrictCoordinator] Starting {len(self.tiles)} tile workers: {self.tiles}")
+        for r0, r1 in self.tiles:
+            worker = mp.Process(
+                target=_tile_worker,
+                args=(self._shm.name, self.fields.shape, r0, r1, self.cycle_seconds, self.mixing_rate,
+                      self._command, self._start, self._done, self._step_barrier, self.step_timeout_sec),
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+        return self
+
+    def run(self, steps: int, aggregate_every: int = 1) -> List[dict]:
+        """
+        Advances the district by `steps` cycles, collecting aggregates every `aggregate_every` steps.
+        Raises RuntimeError, after stopping all workers, if a worker fails or a batch times out.
+        """
+        aggregates = []
+        remaining = steps
+        while remaining > 0:
+            batch = min(aggregate_every - self.steps_done % aggregate_every, remaining)
+            self._command[0], self._command[1] = batch, self.cur
+            for _ in self._workers:
+                self._start.release()
+            self._wait_batch(self.step_timeout_sec * batch)
+            self.cur = (self.cur + batch) % 2
+            self.steps_done += batch
+            remaining -= batch
+            if self.steps_done % aggregate_every == 0:
+                aggregates.append(district_aggregates(self.fields, self.cur, self.steps_done))
+        return aggregates
+
+    def _wait_batch(self, timeout_sec: float):
+        """
+        Collects one done token per worker, checking worker liveness while waiting.
+        """
+        deadline = time.monotonic() + timeout_sec
+        finished = 0
+        while finished < len(self._workers):
+            if self._done.acquire(timeout=0.1):
+                finished += 1
+                continue
+            exited = [tile for tile, worker in zip(self.tiles, self._workers) if not worker.is_alive()]
+            if exited:
+                self._fail(f"tile workers {exited} exited")
+            if time.monotonic() > deadline:
+                self._fail(f"batch did not finish within {timeout_sec:.1f} s")
+
+    def temperatures(self) -> np.ndarray:
+        return self.fields[PLANE["temp_a"] + self.cur].copy()
+
+    def _fail(self, reason: str):
+        """
+        Stops every worker after a failure and raises with the exit codes of the tiles.
+        Workers stuck at the step barrier cannot be woken reliably once a peer died, so they are terminated.
+        """
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        exit_codes = {tile: worker.exitcode for tile, worker in zip(self.tiles, self._workers)}
+        self._workers = []
+        raise RuntimeError(f"District simulation failed ({reason}); tile worker exit codes: {exit_codes}")
+
+    def close(self):
+        if self._workers:
+            self._command[0] = 0
+            for _ in self._workers:
+                self._start.release()
+            for worker in self._workers:
+                worker.join(self.step_timeout_sec)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+            self._workers = []
+        if self._shm is not None:
+            del self.fields
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        print("[DistrictCoordinator] Workers stopped.")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,337 @@
+# File: /opencryocore/integration/soak_test.py
+
+import contextlib
+import gc
+import json
+import math
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+from opencryocore.control.core_controller import CryoCoreController
+from opencryocore.display.oled_driver import OLEDStatusDisplay
+
+# Samples with fewer cycles than this (e.g. a short final one) are left out of the latency trend
+MIN_LATENCY_CYCLES = 100
+
+
+def current_rss_kb() -> float:
+    """
+    Resident set size of this process in KiB. Uses /proc on Linux, peak RSS elsewhere.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if sys.platform == "darwin" else peak
+
+
+def linear_slope(xs: List[float], ys: List[float]) -> float:
+    """
+    Least-squares slope of ys against xs (0.0 with fewer than two points).
+    """
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def theil_sen_slope(xs: List[float], ys: List[float]) -> float:
+    """
+    Median of the pairwise slopes of ys against xs; a few outlying samples barely move it.
+    """
+    slopes = [(ys[j] - ys[i]) / (xs[j] - xs[i])
+              for i in range(len(xs)) for j in range(i + 1, len(xs)) if xs[j] != xs[i]]
+    return statistics.median(slopes) if slopes else 0.0
+
+
+class HeadlessOLED:
+    """
+    Stands in for the SSD1306 panel so OLEDStatusDisplay renders real frames without I2C hardware.
+    """
+
+    def __init__(self):
+        self.frame = None
+
+    def fill(self, color):
+        pass
+
+    def image(self, image):
+        self.frame = image
+
+    def show(self):
+        pass
+
+
+def default_display_callbacks(controller: CryoCoreController):
+    """
+    The real display code paths at their usual refresh periods (virtual seconds): the web
+    dashboard's JSON status, CryoCoreUI.refresh in a hidden window and OLEDStatusDisplay with
+    a headless panel. The touch UI needs a display server; without one it is skipped.
+    :return: (period_seconds, callable) pairs, notes on skipped displays, and cleanup callables
+    """
+    def web_status():
+        return json.dumps(controller.get_status())
+
+    oled = OLEDStatusDisplay(controller.get_status, display=HeadlessOLED())
+    callbacks: List[Tuple[float, Callable[[], object]]] = [(10.0, web_status), (2.0, oled.update_display)]
+    skipped: List[str] = []
+    cleanups: List[Callable[[], object]] = []
+    try:
+        import tkinter
+        from opencryocore.display.touch_ui import CryoCoreUI
+    except ImportError as e:
+        skipped.append(f"touch_ui: {e}")
+        return callbacks, skipped, cleanups
+    try:
+        ui = CryoCoreUI(controller.get_status, controller.shutdown, start_worker=False)
+    except tkinter.TclError as e:
+        skipped.append(f"touch_ui: {e}")
+        return callbacks, skipped, cleanups
+    ui.root.withdraw()
+    callbacks.append((1.0, ui.refresh))
+    cleanups.append(ui.root.destroy)
+    return callbacks, skipped, cleanups
+
+
+class SoakTest:
+    """
+    Long-run soak test of a CryoCoreController plus display callbacks in virtual time.
+
+    Simulated months run back to back without sleeping. At every sample interval the harness
+    records traced Python memory, RSS, live object count and per-cycle latency. A tracemalloc
+    snapshot is taken at the first sample after a warm-up period of virtual time and another at
+    the end of the run; trends use the samples after the first one, so they all see the same
+    harness state, and comparing the two points at the allocation sites that grew, leaving out
+    the harness's own. The run fails when the growth trends exceed the configured slopes.
+
+    Wall-clock latency is noisy, so its trend uses the median cycle time of each sample and a
+    Theil-Sen slope. It only fails when the slope is above the limit, clearly outside the
+    sample-to-sample noise (latency_noise_z standard errors), and adds up to at least
+    min_latency_growth_percent over the trend, above the drift machine load causes on short runs.
+    """
+
+    def __init__(self, simulated_days: float = 30.0, cycle_seconds: float = 60.0, sample_interval_hours: float = 24.0,
+                 controller_factory: Callable[[], CryoCoreController] = None, display_callbacks=None,
+                 max_memory_slope_kb_per_day: float = 16.0, max_rss_slope_kb_per_day: float = 256.0,
+                 max_object_slope_per_day: float = 200.0, max_latency_slope_percent_per_day: float = 1.0,
+                 warmup_days: float = 1.0, top_allocations: int = 10, trace_frames: int = 1, quiet: bool = True,
+                 latency_noise_z: float = 3.0, min_latency_samples: int = 5, min_latency_growth_percent: float = 10.0):
+        """
+        :param simulated_days: Virtual time to cover
+        :param cycle_seconds: Controller cycle period in virtual seconds
+        :param sample_interval_hours: Virtual time between measurements
+        :param controller_factory: Builds the controller under test (default: CryoCoreController("soak"))
+        :param display_callbacks: List of (period_seconds, callable); default runs the web, touch UI and OLED code
+        :param max_memory_slope_kb_per_day: Allowed growth of traced Python memory
+        :param max_rss_slope_kb_per_day: Allowed growth of resident set size
+        :param max_object_slope_per_day: Allowed growth of live gc-tracked objects
+        :param max_latency_slope_percent_per_day: Allowed growth of median cycle latency, relative to its median
+        :param warmup_days: Virtual time excluded from trends (caches, lazy imports, allocator growth)
+        :param top_allocations: Number of allocation sites listed in the report
+        :param trace_frames: Frames tracemalloc keeps per allocation; more frames cost more per cycle
+        :param quiet: Silence per-cycle console output while soaking
+        :param latency_noise_z: Standard errors a latency slope must exceed to count as a trend
+        :param min_latency_samples: Samples needed before the latency trend is judged at all
+        :param min_latency_growth_percent: Total latency growth over the trend below which a slope is not a failure
+        """
+        interval_days = sample_interval_hours / 24
+        baseline_day = max(math.ceil(round(warmup_days / interval_days, 9)), 1) * interval_days
+        if simulated_days < baseline_day + 2 * interval_days:
+            raise ValueError(f"simulated_days ({simulated_days}) must cover warmup_days ({warmup_days}) plus two "
+                             f"more sample intervals ({sample_interval_hours} h) to measure a trend")
+        self.simulated_days = simulated_days
+        self.cycle_seconds = cycle_seconds
+        self.sample_interval_seconds = sample_interval_hours * 3600
+        self.controller_factory = controller_factory or (lambda: CryoCoreController(cluster_id="soak"))
+        self.display_callbacks = display_callbacks
+        self.max_memory_slope_kb_per_day = max_memory_slope_kb_per_day
+        self.max_rss_slope_kb_per_day = max_rss_slope_kb_per_day
+        self.max_object_slope_per_day = max_object_slope_per_day
+        self.max_latency_slope_percent_per_day = max_latency_slope_percent_per_day
+        self.warmup_days = warmup_days
+        self.top_allocations = top_allocations
+        self.trace_frames = trace_frames
+        self.quiet = quiet
+        self.latency_noise_z = latency_noise_z
+        self.min_latency_samples = min_latency_samples
+        self.min_latency_growth_percent = min_latency_growth_percent
+        self.samples: List[dict] = []
+        self.skipped_displays: List[str] = []
+
+    def _sample(self, day: float, latencies: List[float]) -> dict:
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+        latencies = sorted(latencies)
+        return {
+            "day": round(day, 3),
+            "traced_kb": round(traced / 1024, 1),
+            "rss_kb": round(current_rss_kb(), 1),
+            "objects": len(gc.get_objects()),
+            "cycles": len(latencies),
+            "mean_latency_us": round(1e6 * sum(latencies) / len(latencies), 1) if latencies else 0.0,
+            "p50_latency_us": round(1e6 * latencies[len(latencies) // 2], 1) if latencies else 0.0,
+            "p99_latency_us": round(1e6 * latencies[int(0.99 * (len(latencies) - 1))], 1) if latencies else 0.0
+        }
+
+    def run(self) -> dict:
+        """
+        Runs the soak and returns the report. report["passed"] is False when a threshold was exceeded.
+        """
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(self.trace_frames)
+        cleanups = []
+        self.samples = []
+        baseline_snapshot = None
+        last_snapshot = None
+        trend_start = None
+        duration = self.simulated_days * 86400
+        warmup = self.warmup_days * 86400
+        start = time.perf_counter()
+
+        try:
+            with open(os.devnull, "w") as devnull, \
+                    (contextlib.redirect_stdout(devnull) if self.quiet else contextlib.nullcontext()):
+                controller = self.controller_factory()
+                controller.initialize()
+                controller.set_cycle_period(self.cycle_seconds)
+                if self.display_callbacks is not None:
+                    callbacks, self.skipped_displays = self.display_callbacks, []
+                else:
+                    callbacks, self.skipped_displays, cleanups = default_display_callbacks(controller)
+                next_callback = [period for period, _ in callbacks]
+
+                elapsed = 0.0
+                next_sample = self.sample_interval_seconds
+                latencies: List[float] = []
+                while elapsed < duration and controller.operational:
+                    step = min(controller.cycle_seconds, duration - elapsed)
+                    t0 = time.perf_counter()
+                    controller.run_virtual(step)
+                    latencies.append(time.perf_counter() - t0)
+                    elapsed += step
+
+                    for i, (period, callback) in enumerate(callbacks):
+                        # Refreshes between two cycles would all see the same status, so run a due display once
+                        if next_callback[i] <= elapsed:
+                            callback()
+                            next_callback[i] += period * ((elapsed - next_callback[i]) // period + 1)
+
+                    if elapsed >= next_sample or elapsed >= duration:
+                        self.samples.append(self._sample(elapsed / 86400, latencies))
+                        latencies = []
+                        next_sample += self.sample_interval_seconds
+                        # Only two snapshots are kept: each one is large, and holding it changes RSS and
+                        # how often the garbage collector runs, so trends start after the baseline
+                        if baseline_snapshot is None and elapsed >= warmup:
+                            baseline_snapshot = tracemalloc.take_snapshot()
+                            trend_start = len(self.samples)
+                last_snapshot = tracemalloc.take_snapshot()
+        finally:
+            for cleanup in cleanups:
+                cleanup()
+            if not was_tracing:
+                tracemalloc.stop()
+
+        report = self._report(self.samples[trend_start:] if trend_start is not None else [],
+                              baseline_snapshot, last_snapshot)
+        report["wall_seconds"] = round(time.perf_counter() - start, 2)
+        print(f"[SoakTest] {'PASSED' if report['passed'] else 'FAILED'} after {report['simulated_days']} simulated days "
+              f"({report['wall_seconds']} s wall).")
+        for reason in report["failures"]:
+            print(f"[SoakTest] {reason}")
+        for note in self.skipped_displays:
+            print(f"[SoakTest] Skipped {note}")
+        return report
+
+    def _latency_trend(self, trend: List[dict]) -> dict:
+        """
+        Robust trend of the per-sample median latency, with the noise around it.
+        """
+        usable = [s for s in trend if s["cycles"] >= MIN_LATENCY_CYCLES]
+        if len(usable) < self.min_latency_samples:
+            return {"judged": False, "reason": f"{len(usable)} usable samples, need {self.min_latency_samples}"}
+        days = [s["day"] for s in usable]
+        p50 = [s["p50_latency_us"] for s in usable]
+        slope = theil_sen_slope(days, p50)
+        intercept = statistics.median([y - slope * x for x, y in zip(days, p50)])
+        noise = 1.4826 * statistics.median([abs(y - intercept - slope * x) for x, y in zip(days, p50)])
+        mean_day = sum(days) / len(days)
+        spread = math.sqrt(sum((x - mean_day) ** 2 for x in days))
+        stderr = noise / spread if spread else float("inf")
+        median = statistics.median(p50)
+        return {
+            "judged": True,
+            "p50_latency_us_per_day": round(slope, 3),
+            "p50_latency_percent_per_day": round(100.0 * slope / median, 3) if median else 0.0,
+            "slope_stderr_us_per_day": round(stderr, 3),
+            "growth_percent": round(100.0 * slope * (days[-1] - days[0]) / median, 3) if median else 0.0,
+            "significant": slope > self.latency_noise_z * stderr
+        }
+
+    def _report(self, trend: List[dict], baseline_snapshot, last_snapshot) -> dict:
+        days = [s["day"] for s in trend]
+        slopes = {
+            "traced_kb_per_day": round(linear_slope(days, [s["traced_kb"] for s in trend]), 3),
+            "rss_kb_per_day": round(linear_slope(days, [s["rss_kb"] for s in trend]), 3),
+            "objects_per_day": round(linear_slope(days, [s["objects"] for s in trend]), 3)
+        }
+        limits = {
+            "traced_kb_per_day": self.max_memory_slope_kb_per_day,
+            "rss_kb_per_day": self.max_rss_slope_kb_per_day,
+            "objects_per_day": self.max_object_slope_per_day
+        }
+        failures = [f"{name} slope {slopes[name]} exceeds {limits[name]}" for name in limits if slopes[name] > limits[name]]
+
+        latency = self._latency_trend(trend)
+        limits["p50_latency_percent_per_day"] = self.max_latency_slope_percent_per_day
+        if latency["judged"]:
+            slopes["p50_latency_percent_per_day"] = latency["p50_latency_percent_per_day"]
+            if latency["significant"] and latency["p50_latency_percent_per_day"] > self.max_latency_slope_percent_per_day \
+                    and latency["growth_percent"] >= self.min_latency_growth_percent:
+                failures.append(f"p50_latency_percent_per_day slope {latency['p50_latency_percent_per_day']} exceeds "
+                                f"{self.max_latency_slope_percent_per_day} "
+                                f"(> {self.latency_noise_z} x stderr {latency['slope_stderr_us_per_day']} us/day, "
+                                f"{latency['growth_percent']}% over the trend)")
+
+        top = []
+        if baseline_snapshot is not None and last_snapshot is not None:
+            # Leave out what tracemalloc and this harness allocate, so the list shows the code under test
+            exclude = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            growth = last_snapshot.filter_traces(exclude).compare_to(baseline_snapshot.filter_traces(exclude), "lineno")
+            for stat in growth[:self.top_allocations]:
+                frame = stat.traceback[0]
+                top.append({
+                    "site": f"{frame.filename}:{frame.lineno}",
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff
+                })
+
+        return {
+            "passed": not failures,
+            "failures": failures,
+            "simulated_days": self.samples[-1]["day"] if self.samples else 0.0,
+            "slopes": slopes,
+            "limits": limits,
+            "latency_trend": latency,
+            "skipped_displays": self.skipped_displays,
+            "top_allocation_growth": top,
+            "samples": self.samples
+        }
+
+
+if __name__ == "__main__":
+    report = SoakTest().run()
+    for key in ("slopes", "latency_trend", "top_allocation_growth"):
+        print(f"[SoakTest] {key}: {json.dumps(report[key], indent=2)}")
+    sys.exit(0 if report["passed"] else 1)